@@ -13,7 +13,12 @@ from contextlib import contextmanager
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 
 from .config import VelociraptorConfig, load_config
-from .error_handling import is_retryable_grpc_error
+from .error_handling import (
+    GrpcCircuitBreaker,
+    build_channel_options,
+    is_retryable_grpc_error,
+)
+from .grpc_pool import DEFAULT_POOL_SIZE, ChannelPool
 
 # Import Velociraptor gRPC stubs
 try:
@@ -29,16 +34,23 @@ except ImportError:
 class VelociraptorClient:
     """Client for interacting with Velociraptor server via gRPC API."""
 
-    def __init__(self, config: Optional[VelociraptorConfig] = None):
+    def __init__(
+        self,
+        config: Optional[VelociraptorConfig] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
         """Initialize the Velociraptor client.
 
         Args:
             config: Configuration for connecting to Velociraptor.
                    If not provided, will be loaded from environment.
+            pool_size: Number of gRPC channels to spread calls across
         """
         self.config = config or load_config()
-        self._channel: Optional[grpc.Channel] = None
-        self._stub: Optional[Any] = None
+        self.pool_size = pool_size
+        self._pool: Optional[ChannelPool] = None
+        self._stubs: dict[grpc.Channel, Any] = {}
+        self.circuit_breaker = GrpcCircuitBreaker()
 
     @contextmanager
     def _temp_cert_files(self):
@@ -82,8 +94,8 @@ class VelociraptorClient:
                 except OSError:
                     pass
 
-    def _create_channel(self) -> grpc.Channel:
-        """Create a gRPC channel with TLS credentials."""
+    def _create_pool(self) -> ChannelPool:
+        """Create a pool of gRPC channels with TLS credentials."""
         if api_pb2_grpc is None:
             raise ImportError(
                 "pyvelociraptor is required. Install with: pip install pyvelociraptor"
@@ -112,23 +124,49 @@ class VelociraptorClient:
             elif api_url.startswith("http://"):
                 api_url = api_url[7:]
 
-            # Create the channel
-            channel = grpc.secure_channel(api_url, credentials)
-
-            return channel
+            # Create the channels with native retries for transient failures
+            return ChannelPool(
+                api_url,
+                credentials,
+                size=self.pool_size,
+                options=build_channel_options(),
+            )
 
     def connect(self) -> None:
         """Establish connection to the Velociraptor server."""
-        if self._channel is None:
-            self._channel = self._create_channel()
-            self._stub = api_pb2_grpc.APIStub(self._channel)
+        if self._pool is None:
+            self._pool = self._create_pool()
+            self._stubs = {
+                channel: api_pb2_grpc.APIStub(channel)
+                for channel in self._pool.channels
+            }
 
     def close(self) -> None:
         """Close the connection to the Velociraptor server."""
-        if self._channel is not None:
-            self._channel.close()
-            self._channel = None
-            self._stub = None
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+            self._stubs = {}
+
+    @staticmethod
+    def _build_request(
+        queries: list[Any],
+        env: Optional[dict[str, Any]],
+        org_id: Optional[str],
+    ) -> Any:
+        """Build a VQLCollectorArgs request for one or more VQL statements."""
+        env_list = []
+        if env:
+            for key, value in env.items():
+                env_list.append(
+                    api_pb2.VQLEnv(key=key, value=json.dumps(value))
+                )
+
+        return api_pb2.VQLCollectorArgs(
+            Query=queries,
+            env=env_list,
+            org_id=org_id or "",
+        )
 
     @retry(
         retry=retry_if_exception(is_retryable_grpc_error),
@@ -145,8 +183,10 @@ class VelociraptorClient:
     ) -> list[dict[str, Any]]:
         """Execute a VQL query and return results.
 
-        Automatic retry on transient failures (UNAVAILABLE, DEADLINE_EXCEEDED,
-        RESOURCE_EXHAUSTED) with exponential backoff (1s, 2s, 4s up to 10s max).
+        UNAVAILABLE is retried by the gRPC channel itself. RESOURCE_EXHAUSTED
+        moves straight on to the next pooled channel, at most once per channel.
+        DEADLINE_EXCEEDED is retried here with exponential backoff (1s, 2s, 4s
+        up to 10s max). Each status code is retried by exactly one layer.
         No retry on validation errors, authentication errors, or not found errors.
 
         Args:
@@ -157,27 +197,26 @@ class VelociraptorClient:
 
         Returns:
             List of result rows as dictionaries
+
+        Raises:
+            CircuitOpenError: If recent calls found the server unreachable
         """
-        if self._stub is None:
+        if self._pool is None:
             self.connect()
 
-        # Build the request
-        env_list = []
-        if env:
-            for key, value in env.items():
-                env_list.append(
-                    api_pb2.VQLEnv(key=key, value=json.dumps(value))
-                )
+        request = self._build_request([api_pb2.VQLRequest(VQL=vql)], env, org_id)
 
-        request = api_pb2.VQLCollectorArgs(
-            Query=[api_pb2.VQLRequest(VQL=vql)],
-            env=env_list,
-            org_id=org_id or "",
+        return self.circuit_breaker.call(
+            self._pool.call,
+            lambda channel: self._collect_query(channel, request, timeout),
         )
 
-        # Execute the query and collect results
+    def _collect_query(
+        self, channel: grpc.Channel, request: Any, timeout: float
+    ) -> list[dict[str, Any]]:
+        """Execute a prepared VQL request on a channel and collect all rows."""
         results = []
-        for response in self._stub.Query(request, timeout=timeout):
+        for response in self._stubs[channel].Query(request, timeout=timeout):
             if response.Response:
                 # Parse JSON response
                 try:
@@ -192,6 +231,75 @@ class VelociraptorClient:
 
         return results
 
+    @retry(
+        retry=retry_if_exception(is_retryable_grpc_error),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        stop=stop_after_attempt(3),
+        reraise=True,
+    )
+    def query_batch(
+        self,
+        vqls: list[str],
+        env: Optional[dict[str, Any]] = None,
+        org_id: Optional[str] = None,
+        timeout: float = 30.0,
+    ) -> list[list[dict[str, Any]]]:
+        """Execute several VQL queries in a single round-trip.
+
+        Each statement is sent as its own named VQLRequest in one
+        VQLCollectorArgs, and the streamed responses are sorted back out by
+        name. Retries behave as for query().
+
+        Args:
+            vqls: The VQL queries to execute
+            env: Optional environment variables shared by every query
+            org_id: Optional organization ID for multi-tenant setups
+            timeout: Timeout in seconds for the whole batch (default: 30.0)
+
+        Returns:
+            One list of result rows per query, in the order given
+
+        Raises:
+            CircuitOpenError: If recent calls found the server unreachable
+        """
+        if self._pool is None:
+            self.connect()
+
+        request = self._build_request(
+            [api_pb2.VQLRequest(Name=str(i), VQL=vql) for i, vql in enumerate(vqls)],
+            env,
+            org_id,
+        )
+
+        return self.circuit_breaker.call(
+            self._pool.call,
+            lambda channel: self._collect_batch(channel, request, len(vqls), timeout),
+        )
+
+    def _collect_batch(
+        self, channel: grpc.Channel, request: Any, count: int, timeout: float
+    ) -> list[list[dict[str, Any]]]:
+        """Execute a prepared multi-query request and split rows per query."""
+        results: list[list[dict[str, Any]]] = [[] for _ in range(count)]
+        by_name = {str(i): rows for i, rows in enumerate(results)}
+        for response in self._stubs[channel].Query(request, timeout=timeout):
+            if not response.Response:
+                continue
+            target = by_name.get(response.Query.Name)
+            if target is None:
+                # Not tagged with one of our queries, skip
+                continue
+            try:
+                rows = json.loads(response.Response)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(rows, list):
+                target.extend(rows)
+            else:
+                target.append(rows)
+
+        return results
+
     @retry(
         retry=retry_if_exception(is_retryable_grpc_error),
         wait=wait_exponential(multiplier=1, min=1, max=10),
@@ -207,8 +315,10 @@ class VelociraptorClient:
     ) -> AsyncIterator[dict[str, Any]]:
         """Execute a VQL query and stream results.
 
-        Automatic retry on transient failures (UNAVAILABLE, DEADLINE_EXCEEDED,
-        RESOURCE_EXHAUSTED) with exponential backoff (1s, 2s, 4s up to 10s max).
+        UNAVAILABLE is retried by the gRPC channel itself. DEADLINE_EXCEEDED
+        is retried here with exponential backoff (1s, 2s, 4s up to 10s max).
+        RESOURCE_EXHAUSTED is not retried, since rows may already have been
+        yielded.
         No retry on validation errors, authentication errors, or not found errors.
 
         Args:
@@ -220,35 +330,36 @@ class VelociraptorClient:
         Yields:
             Result rows as dictionaries
         """
-        if self._stub is None:
+        if self._pool is None:
             self.connect()
 
-        # Build the request
-        env_list = []
-        if env:
-            for key, value in env.items():
-                env_list.append(
-                    api_pb2.VQLEnv(key=key, value=json.dumps(value))
-                )
-
-        request = api_pb2.VQLCollectorArgs(
-            Query=[api_pb2.VQLRequest(VQL=vql)],
-            env=env_list,
-            org_id=org_id or "",
-        )
+        request = self._build_request([api_pb2.VQLRequest(VQL=vql)], env, org_id)
 
-        # Execute the query and stream results
-        for response in self._stub.Query(request, timeout=timeout):
-            if response.Response:
-                try:
-                    rows = json.loads(response.Response)
-                    if isinstance(rows, list):
-                        for row in rows:
-                            yield row
-                    else:
-                        yield rows
-                except json.JSONDecodeError:
-                    pass
+        # Execute the query and stream results. Rows may already have been
+        # yielded when an error arrives, so there is no hop to a sibling channel.
+        token = self.circuit_breaker.before_call()
+        stub = self._stubs[self._pool.pick()]
+        try:
+            for response in stub.Query(request, timeout=timeout):
+                if response.Response:
+                    try:
+                        rows = json.loads(response.Response)
+                        if isinstance(rows, list):
+                            for row in rows:
+                                yield row
+                        else:
+                            yield rows
+                    except json.JSONDecodeError:
+                        pass
+        except grpc.RpcError as e:
+            self.circuit_breaker.record_error(e, token)
+            raise
+        except BaseException:
+            # Consumer stopped early (GeneratorExit) or failed on its side;
+            # the server answered, so resolve a half-open trial as a success.
+            self.circuit_breaker.record_success(token)
+            raise
+        self.circuit_breaker.record_success(token)
 
     def __enter__(self) -> "VelociraptorClient":
         """Context manager entry."""
@@ -5,11 +5,16 @@ Provides certificate management and encrypted credential storage.
 """
 
 from .certificate_manager import CertificateManager, CertificateBundle
-from .credential_store import CredentialStore, StoredCredential
+from .credential_store import (
+    CredentialStore,
+    PasswordCredentialStore,
+    StoredCredential,
+)
 
 __all__ = [
     "CertificateManager",
     "CertificateBundle",
     "CredentialStore",
+    "PasswordCredentialStore",
     "StoredCredential",
 ]
@@ -4,10 +4,14 @@ PKI certificate management for Velociraptor deployments.
 Generates and manages CA, server, and client certificates for mTLS.
 """
 
+import base64
 import os
 import secrets
+import shutil
+import tempfile
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import cached_property
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -25,6 +29,8 @@ try:
 except ImportError:
     HAS_CRYPTOGRAPHY = False
 
+from .file_utils import app_data_dir, write_private
+
 
 @dataclass
 class CertificateBundle:
@@ -69,6 +75,72 @@ class CertificateBundle:
         return result
 
 
+def _cert_pem(cert: "x509.Certificate") -> str:
+    """Serialize a certificate to a PEM string."""
+    return cert.public_bytes(Encoding.PEM).decode()
+
+
+def _key_pem(key: "rsa.RSAPrivateKey") -> str:
+    """Serialize a private key to an unencrypted PKCS8 PEM string."""
+    return key.private_bytes(
+        encoding=Encoding.PEM,
+        format=PrivateFormat.PKCS8,
+        encryption_algorithm=NoEncryption(),
+    ).decode()
+
+
+class _LazyCertificateBundle(CertificateBundle):
+    """CertificateBundle that serializes each PEM on first access.
+
+    Returned by generate_bundle so callers that only need a subset of the
+    bundle (e.g. the fingerprint) skip the remaining OpenSSL serializations.
+    """
+
+    def __init__(
+        self,
+        ca_cert: "x509.Certificate",
+        ca_key: "rsa.RSAPrivateKey",
+        server_cert: "x509.Certificate",
+        server_key: "rsa.RSAPrivateKey",
+        api_cert: "x509.Certificate",
+        api_key: "rsa.RSAPrivateKey",
+        ca_fingerprint: str,
+    ):
+        self._objects = {
+            "ca_cert": ca_cert,
+            "ca_key": ca_key,
+            "server_cert": server_cert,
+            "server_key": server_key,
+            "api_cert": api_cert,
+            "api_key": api_key,
+        }
+        self.ca_fingerprint = ca_fingerprint
+
+    @cached_property
+    def ca_cert(self) -> str:
+        return _cert_pem(self._objects["ca_cert"])
+
+    @cached_property
+    def ca_key(self) -> str:
+        return _key_pem(self._objects["ca_key"])
+
+    @cached_property
+    def server_cert(self) -> str:
+        return _cert_pem(self._objects["server_cert"])
+
+    @cached_property
+    def server_key(self) -> str:
+        return _key_pem(self._objects["server_key"])
+
+    @cached_property
+    def api_cert(self) -> str:
+        return _cert_pem(self._objects["api_cert"])
+
+    @cached_property
+    def api_key(self) -> str:
+        return _key_pem(self._objects["api_key"])
+
+
 class CertificateManager:
     """Manages PKI certificates for Velociraptor deployments."""
 
@@ -95,10 +167,10 @@ class CertificateManager:
     def _default_storage_path() -> Path:
         """Get the default certificate storage path."""
         if os.name == "nt":
-            base = Path(os.environ.get("LOCALAPPDATA", "~"))
+            base = os.environ.get("LOCALAPPDATA", "~")
         else:
-            base = Path(os.environ.get("XDG_DATA_HOME", "~/.local/share"))
-        return base.expanduser() / "megaraptor-mcp" / "certs"
+            base = os.environ.get("XDG_DATA_HOME", "~/.local/share")
+        return app_data_dir(base) / "certs"
 
     def _generate_private_key(self, key_size: int = None) -> rsa.RSAPrivateKey:
         """Generate an RSA private key."""
@@ -109,20 +181,17 @@ class CertificateManager:
 
     def _key_to_pem(self, key: rsa.RSAPrivateKey) -> str:
         """Convert private key to PEM string."""
-        return key.private_bytes(
-            encoding=Encoding.PEM,
-            format=PrivateFormat.PKCS8,
-            encryption_algorithm=NoEncryption(),
-        ).decode()
+        return _key_pem(key)
 
     def _cert_to_pem(self, cert: x509.Certificate) -> str:
         """Convert certificate to PEM string."""
-        return cert.public_bytes(Encoding.PEM).decode()
+        return _cert_pem(cert)
 
     def _get_fingerprint(self, cert: x509.Certificate) -> str:
         """Get SHA256 fingerprint of certificate."""
         fingerprint = cert.fingerprint(hashes.SHA256())
-        return fingerprint.hex().upper()
+        # b16encode emits uppercase hex directly, avoiding a separate .upper() pass
+        return base64.b16encode(fingerprint).decode()
 
     def generate_ca(
         self,
@@ -355,7 +424,7 @@ class CertificateManager:
             rapid: Use short validity for rapid deployment
 
         Returns:
-            Complete certificate bundle
+            Complete certificate bundle (PEMs are serialized on first access)
         """
         if rapid:
             cert_validity_days = cert_validity_days or self.RAPID_CERT_VALIDITY_DAYS
@@ -393,13 +462,13 @@ class CertificateManager:
             validity_days=cert_validity_days,
         )
 
-        return CertificateBundle(
-            ca_cert=self._cert_to_pem(ca_cert),
-            ca_key=self._key_to_pem(ca_key),
-            server_cert=self._cert_to_pem(server_cert),
-            server_key=self._key_to_pem(server_key),
-            api_cert=self._cert_to_pem(api_cert),
-            api_key=self._key_to_pem(api_key),
+        return _LazyCertificateBundle(
+            ca_cert=ca_cert,
+            ca_key=ca_key,
+            server_cert=server_cert,
+            server_key=server_key,
+            api_cert=api_cert,
+            api_key=api_key,
             ca_fingerprint=self._get_fingerprint(ca_cert),
         )
 
@@ -418,24 +487,41 @@ class CertificateManager:
             Path to the bundle directory
         """
         bundle_path = self.storage_path / deployment_id
-        bundle_path.mkdir(parents=True, exist_ok=True)
-
-        # Save each file
-        (bundle_path / "ca.crt").write_text(bundle.ca_cert)
-        (bundle_path / "ca.key").write_text(bundle.ca_key)
-        (bundle_path / "server.crt").write_text(bundle.server_cert)
-        (bundle_path / "server.key").write_text(bundle.server_key)
-        (bundle_path / "api_client.crt").write_text(bundle.api_cert)
-        (bundle_path / "api_client.key").write_text(bundle.api_key)
+        self.storage_path.mkdir(parents=True, exist_ok=True)
 
-        # Set restrictive permissions on private keys
-        if os.name != "nt":
-            os.chmod(bundle_path / "ca.key", 0o600)
-            os.chmod(bundle_path / "server.key", 0o600)
-            os.chmod(bundle_path / "api_client.key", 0o600)
-
-        # Save fingerprint for reference
-        (bundle_path / "ca.fingerprint").write_text(bundle.ca_fingerprint)
+        # Write into a staging directory and swap it into place, so a failed
+        # save or rotation never leaves a mix of old and new certificates.
+        staging_path = Path(tempfile.mkdtemp(
+            prefix=f".{deployment_id}.", dir=self.storage_path
+        ))
+        try:
+            (staging_path / "ca.crt").write_text(bundle.ca_cert)
+            (staging_path / "server.crt").write_text(bundle.server_cert)
+            (staging_path / "api_client.crt").write_text(bundle.api_cert)
+
+            # Private keys are created with restrictive permissions
+            write_private(staging_path / "ca.key", bundle.ca_key.encode())
+            write_private(staging_path / "server.key", bundle.server_key.encode())
+            write_private(staging_path / "api_client.key", bundle.api_key.encode())
+
+            # Save fingerprint for reference
+            (staging_path / "ca.fingerprint").write_text(bundle.ca_fingerprint)
+
+            if bundle_path.exists():
+                old_path = staging_path.with_name(staging_path.name + ".old")
+                os.replace(bundle_path, old_path)
+                try:
+                    os.replace(staging_path, bundle_path)
+                except BaseException:
+                    # Put the previous bundle back rather than leave none
+                    os.replace(old_path, bundle_path)
+                    raise
+                shutil.rmtree(old_path, ignore_errors=True)
+            else:
+                os.replace(staging_path, bundle_path)
+        except BaseException:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            raise
 
         return bundle_path
 
@@ -475,8 +561,6 @@ class CertificateManager:
         Returns:
             True if deleted, False if not found
         """
-        import shutil
-
         bundle_path = self.storage_path / deployment_id
         if not bundle_path.exists():
             return False
@@ -2,7 +2,8 @@
 Encrypted credential storage for deployment secrets.
 
 Uses AES-256-GCM for encryption with key derivation from a master password
-or machine-specific key file.
+or machine-specific key file. On CPUs without hardware AES support the store
+falls back to ChaCha20-Poly1305, which is considerably faster in software.
 """
 
 import base64
@@ -13,16 +14,41 @@ import secrets
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Any
+from typing import Any, Iterable, Optional
 
 try:
-    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-    from cryptography.hazmat.primitives import hashes
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
     HAS_CRYPTOGRAPHY = True
 except ImportError:
     HAS_CRYPTOGRAPHY = False
 
+from .file_utils import app_data_dir, load_or_create_secret
+
+
+def _has_hardware_aes() -> bool:
+    """Detect whether the CPU advertises hardware AES acceleration.
+
+    Reads /proc/cpuinfo where available ("aes" on x86, "aes"/"pmull" in the
+    ARM feature list). Platforms without /proc/cpuinfo (Windows, macOS) are
+    assumed to have AES acceleration, as all their supported CPUs do.
+    """
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8", errors="replace") as f:
+            cpuinfo = f.read()
+    except OSError:
+        return True
+
+    for line in cpuinfo.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() in ("flags", "features"):
+            if "aes" in value.split():
+                return True
+    return False
+
+
+HAS_HARDWARE_AES = _has_hardware_aes()
+
 
 @dataclass
 class StoredCredential:
@@ -45,12 +71,21 @@ class StoredCredential:
     deployment_id: Optional[str]
     data: dict[str, Any]
 
-    def is_expired(self) -> bool:
-        """Check if the credential has expired."""
-        if not self.expires_at:
+    def __post_init__(self) -> None:
+        """Parse the expiry timestamp once instead of on every check."""
+        self._expires_at_dt: Optional[datetime] = (
+            datetime.fromisoformat(self.expires_at) if self.expires_at else None
+        )
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        """Check if the credential has expired.
+
+        Args:
+            now: Reference time (default: current UTC time)
+        """
+        if self._expires_at_dt is None:
             return False
-        expiry = datetime.fromisoformat(self.expires_at)
-        return datetime.now(timezone.utc) > expiry
+        return (now or datetime.now(timezone.utc)) > self._expires_at_dt
 
     def to_dict(self) -> dict:
         """Convert to dictionary (excludes sensitive data)."""
@@ -68,14 +103,18 @@ class StoredCredential:
 class CredentialStore:
     """AES-256-GCM encrypted credential storage.
 
-    Credentials are stored in a JSON file encrypted with a key derived from
-    either a master password or a machine-specific key file.
+    Credentials are stored in a JSON file encrypted with a random key kept in
+    a machine-specific key file (see PasswordCredentialStore for keys derived
+    from a master password). The encrypted
+    file is prefixed with a one-byte cipher ID so stores written with
+    ChaCha20-Poly1305 (used when the CPU lacks AES instructions) remain
+    readable on any host.
     """
 
-    SALT_SIZE = 16
     NONCE_SIZE = 12
+    CIPHER_AES_GCM = 1
+    CIPHER_CHACHA20_POLY1305 = 2
     KEY_SIZE = 32  # 256 bits
-    ITERATIONS = 600_000  # OWASP recommendation for PBKDF2-SHA256
 
     def __init__(self, store_path: Optional[Path] = None, key_file: Optional[Path] = None):
         """Initialize the credential store.
@@ -93,70 +132,75 @@ class CredentialStore:
         self.store_path = store_path or self._default_store_path()
         self.key_file = key_file or self._default_key_file()
         self._encryption_key: Optional[bytes] = None
+        self._aeads: dict[int, Any] = {}
+        self._cipher_id = (
+            self.CIPHER_AES_GCM if HAS_HARDWARE_AES else self.CIPHER_CHACHA20_POLY1305
+        )
 
     @staticmethod
     def _default_store_path() -> Path:
         """Get the default credential store path."""
         if os.name == "nt":
-            base = Path(os.environ.get("LOCALAPPDATA", "~"))
+            base = os.environ.get("LOCALAPPDATA", "~")
         else:
-            base = Path(os.environ.get("XDG_DATA_HOME", "~/.local/share"))
-        return base.expanduser() / "megaraptor-mcp" / "credentials.enc"
+            base = os.environ.get("XDG_DATA_HOME", "~/.local/share")
+        return app_data_dir(base) / "credentials.enc"
 
     @staticmethod
     def _default_key_file() -> Path:
         """Get the default key file path."""
         if os.name == "nt":
-            base = Path(os.environ.get("LOCALAPPDATA", "~"))
+            base = os.environ.get("LOCALAPPDATA", "~")
         else:
-            base = Path(os.environ.get("XDG_DATA_HOME", "~/.local/share"))
-        return base.expanduser() / "megaraptor-mcp" / ".keyfile"
+            base = os.environ.get("XDG_DATA_HOME", "~/.local/share")
+        return app_data_dir(base) / ".keyfile"
 
     def _ensure_key(self) -> bytes:
         """Ensure the encryption key exists and return it."""
         if self._encryption_key:
             return self._encryption_key
 
-        self.key_file.parent.mkdir(parents=True, exist_ok=True)
-
-        if self.key_file.exists():
-            # Load existing key
-            self._encryption_key = self.key_file.read_bytes()
-        else:
-            # Generate new random key
-            self._encryption_key = secrets.token_bytes(self.KEY_SIZE)
-            # Save with restrictive permissions
-            self.key_file.write_bytes(self._encryption_key)
-            if os.name != "nt":
-                os.chmod(self.key_file, 0o600)
-
+        self._encryption_key = load_or_create_secret(self.key_file, self.KEY_SIZE)
         return self._encryption_key
 
-    def _derive_key(self, password: str, salt: bytes) -> bytes:
-        """Derive encryption key from password using PBKDF2."""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=self.KEY_SIZE,
-            salt=salt,
-            iterations=self.ITERATIONS,
-        )
-        return kdf.derive(password.encode())
+    def _aead(self, cipher_id: int) -> Optional[Any]:
+        """Get the cached AEAD cipher instance for a cipher ID.
+
+        Returns None for unknown cipher IDs.
+        """
+        aead = self._aeads.get(cipher_id)
+        if aead is None:
+            if cipher_id == self.CIPHER_AES_GCM:
+                aead_cls = AESGCM
+            elif cipher_id == self.CIPHER_CHACHA20_POLY1305:
+                aead_cls = ChaCha20Poly1305
+            else:
+                return None
+            aead = self._aeads[cipher_id] = aead_cls(self._ensure_key())
+        return aead
 
     def _encrypt(self, data: bytes) -> bytes:
-        """Encrypt data using AES-256-GCM."""
-        key = self._ensure_key()
+        """Encrypt data using AES-256-GCM or ChaCha20-Poly1305."""
         nonce = secrets.token_bytes(self.NONCE_SIZE)
-        aesgcm = AESGCM(key)
-        ciphertext = aesgcm.encrypt(nonce, data, None)
-        return nonce + ciphertext
+        ciphertext = self._aead(self._cipher_id).encrypt(nonce, data, None)
+        return bytes([self._cipher_id]) + nonce + ciphertext
 
     def _decrypt(self, data: bytes) -> bytes:
-        """Decrypt data using AES-256-GCM."""
-        key = self._ensure_key()
+        """Decrypt data written by _encrypt."""
+        aead = self._aead(data[0]) if data else None
+        if aead is not None:
+            nonce = data[1:1 + self.NONCE_SIZE]
+            ciphertext = data[1 + self.NONCE_SIZE:]
+            try:
+                return aead.decrypt(nonce, ciphertext, None)
+            except InvalidTag:
+                # Could be a legacy store whose nonce starts with a valid ID
+                pass
+
+        # Stores written before the cipher prefix are bare AES-GCM
         nonce = data[:self.NONCE_SIZE]
         ciphertext = data[self.NONCE_SIZE:]
-        aesgcm = AESGCM(key)
-        return aesgcm.decrypt(nonce, ciphertext, None)
+        return self._aead(self.CIPHER_AES_GCM).decrypt(nonce, ciphertext, None)
 
     def _load_store(self) -> dict[str, dict]:
         """Load and decrypt the credential store."""
@@ -197,6 +241,24 @@ class CredentialStore:
         self._save_store(store)
         return credential.id
 
+    def store_many(self, credentials: Iterable[StoredCredential]) -> list[str]:
+        """Store several credentials with a single decrypt/encrypt pass.
+
+        Args:
+            credentials: The credentials to store
+
+        Returns:
+            The credential IDs, in input order
+        """
+        store = self._load_store()
+        ids = []
+        for credential in credentials:
+            store[credential.id] = asdict(credential)
+            ids.append(credential.id)
+        if ids:
+            self._save_store(store)
+        return ids
+
     def get(self, credential_id: str) -> Optional[StoredCredential]:
         """Retrieve a credential by ID.
 
@@ -244,12 +306,13 @@ class CredentialStore:
         """
         store = self._load_store()
         credentials = []
+        now = datetime.now(timezone.utc)
 
         for data in store.values():
             cred = StoredCredential(**data)
             if deployment_id and cred.deployment_id != deployment_id:
                 continue
-            if not include_expired and cred.is_expired():
+            if not include_expired and cred.is_expired(now):
                 continue
             # Return credential info without sensitive data
             cred.data = {"_redacted": True}
@@ -265,14 +328,18 @@ class CredentialStore:
         """
         store = self._load_store()
         initial_count = len(store)
+        now = datetime.now(timezone.utc)
 
+        # Check the raw expiry field rather than building a StoredCredential per row
         store = {
             k: v for k, v in store.items()
-            if not StoredCredential(**v).is_expired()
+            if not v.get("expires_at") or now <= datetime.fromisoformat(v["expires_at"])
         }
 
-        self._save_store(store)
-        return initial_count - len(store)
+        removed = initial_count - len(store)
+        if removed:
+            self._save_store(store)
+        return removed
 
     def clear_deployment(self, deployment_id: str) -> int:
         """Remove all credentials for a deployment.
@@ -291,8 +358,114 @@ class CredentialStore:
             if v.get("deployment_id") != deployment_id
         }
 
-        self._save_store(store)
-        return initial_count - len(store)
+        removed = initial_count - len(store)
+        if removed:
+            self._save_store(store)
+        return removed
+
+
+class PasswordCredentialStore(CredentialStore):
+    """Credential store encrypted with a key derived from a master password.
+
+    The key is derived with PBKDF2-HMAC-SHA256 from the password and a random
+    salt persisted next to the store. PBKDF2 is only imported by this class,
+    so the default key-file store never loads it.
+
+    The store lives in its own file, separate from the key-file store, and a
+    store that does not decrypt raises instead of reading as empty, so a
+    wrong password can never lead to the existing credentials being
+    overwritten.
+    """
+
+    SALT_SIZE = 16
+    ITERATIONS = 600_000  # OWASP recommendation for PBKDF2-SHA256
+
+    def __init__(
+        self,
+        password: str,
+        store_path: Optional[Path] = None,
+        salt_file: Optional[Path] = None,
+    ):
+        """Initialize the password-protected credential store.
+
+        Args:
+            password: Master password used to derive the encryption key
+            store_path: Path to the encrypted store file
+            salt_file: Path to the salt file (created if not exists)
+
+        Raises:
+            ValueError: If the password is empty
+        """
+        if not password:
+            raise ValueError("Master password cannot be empty")
+
+        super().__init__(
+            store_path=store_path,
+            key_file=salt_file or self._default_salt_file(),
+        )
+        self._password = password
+
+    @staticmethod
+    def _default_store_path() -> Path:
+        """Get the default password-protected store path."""
+        if os.name == "nt":
+            base = os.environ.get("LOCALAPPDATA", "~")
+        else:
+            base = os.environ.get("XDG_DATA_HOME", "~/.local/share")
+        return app_data_dir(base) / "credentials.pw.enc"
+
+    @staticmethod
+    def _default_salt_file() -> Path:
+        """Get the default salt file path."""
+        if os.name == "nt":
+            base = os.environ.get("LOCALAPPDATA", "~")
+        else:
+            base = os.environ.get("XDG_DATA_HOME", "~/.local/share")
+        return app_data_dir(base) / ".salt"
+
+    def _ensure_key(self) -> bytes:
+        """Derive the encryption key from the master password."""
+        if self._encryption_key:
+            return self._encryption_key
+
+        salt = load_or_create_secret(self.key_file, self.SALT_SIZE)
+        self._encryption_key = self._derive_key(self._password, salt)
+        return self._encryption_key
+
+    def _load_store(self) -> dict[str, dict]:
+        """Load and decrypt the credential store.
+
+        Raises:
+            ValueError: If the store cannot be decrypted with this password
+        """
+        if not self.store_path.exists():
+            return {}
+
+        encrypted = self.store_path.read_bytes()
+        if not encrypted:
+            return {}
+
+        try:
+            decrypted = self._decrypt(encrypted)
+        except InvalidTag:
+            raise ValueError(
+                f"Cannot decrypt credential store {self.store_path}: "
+                "wrong master password or corrupted store"
+            ) from None
+        return json.loads(decrypted.decode())
+
+    def _derive_key(self, password: str, salt: bytes) -> bytes:
+        """Derive encryption key from password using PBKDF2."""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=self.KEY_SIZE,
+            salt=salt,
+            iterations=self.ITERATIONS,
+        )
+        return kdf.derive(password.encode())
 
 
 def generate_credential_id() -> str:
@@ -315,5 +488,15 @@ def generate_password(length: int = 24) -> str:
         A cryptographically secure random password
     """
     # Use a mix of letters, digits, and safe special characters
-    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*"
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    alphabet = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*"
+    n = len(alphabet)
+    # Reject bytes above the largest multiple of n to keep the choice unbiased
+    max_byte = 256 - (256 % n)
+
+    password = bytearray()
+    while len(password) < length:
+        needed = length - len(password)
+        password.extend(
+            alphabet[b % n] for b in secrets.token_bytes(needed * 2) if b < max_byte
+        )
+    return password[:length].decode()
@@ -0,0 +1,101 @@
+"""
+File helpers shared by the certificate manager and credential store.
+
+Resolves the per-user data directory and writes secrets with owner-only
+permissions.
+"""
+
+import os
+import secrets
+import tempfile
+import time
+from functools import lru_cache
+from pathlib import Path
+
+# How often, and how far apart, a short secret file is re-read before it is
+# treated as corrupt
+_SECRET_READ_ATTEMPTS = 5
+_SECRET_READ_DELAY = 0.05
+
+
+@lru_cache(maxsize=8)
+def app_data_dir(base: str) -> Path:
+    """Resolve the megaraptor-mcp data directory under a base path.
+
+    Cached per base string because expanduser() may query the password
+    database; keying on the environment value keeps overrides effective.
+    """
+    return Path(base).expanduser() / "megaraptor-mcp"
+
+
+def write_private(path: Path, data: bytes) -> None:
+    """Create a file readable only by the owner and write data to it.
+
+    The mode is applied atomically at creation, so the contents are never
+    briefly world-readable. Raises FileExistsError if the file exists.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+
+def load_or_create_secret(path: Path, size: int) -> bytes:
+    """Return the random secret stored at path, creating it if missing.
+
+    A new secret is fully written to a private temporary file and then
+    hard-linked into place. The link fails if the path already exists, so
+    processes racing to create the secret all end up with the winner's
+    complete file and never read a partially written one. On filesystems
+    without hard links (some FUSE/SMB mounts and container volumes) the
+    secret is written with an exclusive create instead, and a reader that
+    finds a short file re-reads it briefly while the writer finishes.
+
+    Args:
+        path: File holding the secret
+        size: Secret length in bytes
+
+    Returns:
+        The secret bytes
+
+    Raises:
+        ValueError: If an existing file does not hold exactly size bytes
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if not path.exists():
+        secret = secrets.token_bytes(size)
+        # mkstemp creates the file with mode 0600
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(secret)
+                f.flush()
+                os.fsync(f.fileno())
+            os.link(tmp_name, path)
+            return secret
+        except FileExistsError:
+            # Another process created the secret first; use theirs
+            pass
+        except OSError:
+            # No hard-link support on this filesystem
+            try:
+                write_private(path, secret)
+                return secret
+            except FileExistsError:
+                pass
+        finally:
+            os.unlink(tmp_name)
+
+    for _ in range(_SECRET_READ_ATTEMPTS):
+        data = path.read_bytes()
+        if len(data) >= size:
+            break
+        # Possibly still being written by the process that created it
+        time.sleep(_SECRET_READ_DELAY)
+    if len(data) != size:
+        raise ValueError(
+            f"{path} holds {len(data)} bytes, expected {size}: "
+            "the file is truncated or corrupted"
+        )
+    return data
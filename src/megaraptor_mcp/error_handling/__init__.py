@@ -10,8 +10,15 @@ from .validators import (
     validate_hunt_id,
     validate_flow_id,
     validate_vql_syntax_basics,
+    vql_string,
 )
 from .grpc_handlers import (
+    CircuitOpenError,
+    GrpcCircuitBreaker,
+    GrpcErrorInfo,
+    build_channel_options,
+    build_default_service_config,
+    grpc_error_info,
     is_retryable_grpc_error,
     map_grpc_error,
 )
@@ -26,7 +33,14 @@ __all__ = [
     "validate_hunt_id",
     "validate_flow_id",
     "validate_vql_syntax_basics",
+    "vql_string",
     # gRPC handlers
+    "CircuitOpenError",
+    "GrpcCircuitBreaker",
+    "GrpcErrorInfo",
+    "build_channel_options",
+    "build_default_service_config",
+    "grpc_error_info",
     "is_retryable_grpc_error",
     "map_grpc_error",
     # VQL helpers
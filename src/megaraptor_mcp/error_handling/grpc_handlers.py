@@ -1,19 +1,89 @@
 """
 gRPC error handling utilities.
 
-Maps gRPC status codes to user-friendly error messages and determines
-which errors are retryable.
+Maps gRPC status codes to user-friendly error messages, builds the channel
+retry policy, determines which errors the application should retry, and
+provides a circuit breaker that fails fast while the server is down.
 """
 
+import json
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
 import grpc
-from typing import Any
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Status codes bound once at import; enum attribute access goes through the
+# EnumMeta machinery on every lookup
+_UNAVAILABLE = grpc.StatusCode.UNAVAILABLE
+_DEADLINE_EXCEEDED = grpc.StatusCode.DEADLINE_EXCEEDED
+_RESOURCE_EXHAUSTED = grpc.StatusCode.RESOURCE_EXHAUSTED
+_NOT_FOUND = grpc.StatusCode.NOT_FOUND
+_INVALID_ARGUMENT = grpc.StatusCode.INVALID_ARGUMENT
+_UNAUTHENTICATED = grpc.StatusCode.UNAUTHENTICATED
+_PERMISSION_DENIED = grpc.StatusCode.PERMISSION_DENIED
+_INTERNAL = grpc.StatusCode.INTERNAL
+
+
+# Status codes retried inside gRPC by the channel's service config. Not
+# DEADLINE_EXCEEDED: the client deadline spans all native attempts. Not
+# RESOURCE_EXHAUSTED: ChannelPool.call retries that once per pooled channel,
+# and stacking retry layers would multiply attempts on an overloaded server.
+_NATIVE_RETRY_CODES = ("UNAVAILABLE",)
+
+# Status codes the application retries once native retries are exhausted:
+# timeouts need a fresh deadline.
+_RETRYABLE_CODES: frozenset[grpc.StatusCode] = frozenset((
+    _DEADLINE_EXCEEDED,
+))
+
+
+def build_default_service_config() -> dict[str, Any]:
+    """Build the gRPC service config with the default retry policy.
+
+    The policy applies to every method on the channel and makes gRPC retry
+    transient failures itself, without a round trip through Python.
+
+    Returns:
+        Service config dictionary (serialize with json.dumps for channel options)
+    """
+    return {
+        "methodConfig": [{
+            "name": [{}],
+            "retryPolicy": {
+                "maxAttempts": 5,
+                "initialBackoff": "0.1s",
+                "maxBackoff": "1s",
+                "backoffMultiplier": 2,
+                "retryableStatusCodes": list(_NATIVE_RETRY_CODES),
+            },
+        }],
+    }
+
+
+def build_channel_options() -> list[tuple[str, Any]]:
+    """Build gRPC channel options enabling the default retry policy.
+
+    Returns:
+        List of (option, value) tuples for grpc.secure_channel
+    """
+    return [
+        ("grpc.enable_retries", 1),
+        ("grpc.service_config", json.dumps(build_default_service_config())),
+    ]
 
 
 def is_retryable_grpc_error(exception: Any) -> bool:
-    """Determine if a gRPC error is retryable.
+    """Determine if a gRPC error should be retried by the application.
 
-    Transient errors like UNAVAILABLE, DEADLINE_EXCEEDED, and RESOURCE_EXHAUSTED
-    should be retried with exponential backoff.
+    UNAVAILABLE is retried natively by the channel (see
+    build_default_service_config) and RESOURCE_EXHAUSTED by the channel
+    pool (see ChannelPool.call), so only DEADLINE_EXCEEDED is retried
+    again with exponential backoff.
 
     Args:
         exception: The exception to check
@@ -26,13 +96,163 @@ def is_retryable_grpc_error(exception: Any) -> bool:
 
     try:
         code = exception.code()
-        return code in (
-            grpc.StatusCode.UNAVAILABLE,
-            grpc.StatusCode.DEADLINE_EXCEEDED,
-            grpc.StatusCode.RESOURCE_EXHAUSTED,
-        )
-    except Exception:
+    except AttributeError:
+        # Bare RpcError without call status
         return False
+    return code in _RETRYABLE_CODES
+
+
+# Hints for each mapped status code
+_UNAVAILABLE_HINT = (
+    "1. Check if the Velociraptor server is running\n"
+    "2. Verify network connectivity\n"
+    "3. Check server URL in configuration"
+)
+_DEADLINE_EXCEEDED_HINT = (
+    "1. Query took too long to execute\n"
+    "2. Try adding LIMIT clause to reduce result set\n"
+    "3. Increase timeout parameter if needed\n"
+    "4. Check if server is under high load"
+)
+_NOT_FOUND_HINT = (
+    "1. Verify the ID is correct (client_id, hunt_id, flow_id, etc.)\n"
+    "2. Use list_* tools to find valid IDs\n"
+    "3. Check if resource was deleted"
+)
+_INVALID_ARGUMENT_HINT = (
+    "1. Check parameter formats (client_id starts with 'C.', etc.)\n"
+    "2. Verify VQL syntax if running a query\n"
+    "3. Use vql_help tool for VQL syntax guidance"
+)
+_UNAUTHENTICATED_HINT = (
+    "1. Check API configuration file path\n"
+    "2. Verify certificate validity\n"
+    "3. Ensure VELOCIRAPTOR_CONFIG environment variable is set correctly"
+)
+_PERMISSION_DENIED_HINT = (
+    "1. Check API client permissions in Velociraptor\n"
+    "2. Verify you have necessary roles for this operation\n"
+    "3. Contact Velociraptor administrator if needed"
+)
+_INTERNAL_HINT = (
+    "1. Check Velociraptor server logs for details\n"
+    "2. This may indicate a bug in the server\n"
+    "3. Try simplifying the query if using VQL"
+)
+_RESOURCE_EXHAUSTED_HINT = (
+    "1. Server is under heavy load\n"
+    "2. Try again after a delay\n"
+    "3. Reduce query complexity or result set size\n"
+    "4. Contact administrator if issue persists"
+)
+_DEFAULT_HINT = "Check server logs or contact administrator for details."
+
+# Status code -> (error message template, hint). Templates are filled with
+# str.format(operation=..., details=..., status=...).
+_STATUS_TABLE: dict[grpc.StatusCode, tuple[str, str]] = {
+    _UNAVAILABLE: (
+        "Velociraptor server is unavailable during {operation}",
+        _UNAVAILABLE_HINT,
+    ),
+    _DEADLINE_EXCEEDED: (
+        "Operation timeout during {operation}",
+        _DEADLINE_EXCEEDED_HINT,
+    ),
+    _NOT_FOUND: (
+        "Resource not found during {operation}",
+        _NOT_FOUND_HINT,
+    ),
+    _INVALID_ARGUMENT: (
+        "Invalid argument during {operation}: {details}",
+        _INVALID_ARGUMENT_HINT,
+    ),
+    _UNAUTHENTICATED: (
+        "Authentication failed during {operation}",
+        _UNAUTHENTICATED_HINT,
+    ),
+    _PERMISSION_DENIED: (
+        "Permission denied during {operation}",
+        _PERMISSION_DENIED_HINT,
+    ),
+    _INTERNAL: (
+        "Internal server error during {operation}: {details}",
+        _INTERNAL_HINT,
+    ),
+    _RESOURCE_EXHAUSTED: (
+        "Server resources exhausted during {operation}",
+        _RESOURCE_EXHAUSTED_HINT,
+    ),
+}
+
+# Fallback for unmapped status codes
+_DEFAULT_ENTRY = ("gRPC error during {operation}: {status} - {details}", _DEFAULT_HINT)
+
+# Codes whose message never includes server details, so it can be cached
+_STATIC_CODES = frozenset(
+    code for code, (template, _) in _STATUS_TABLE.items() if "{details}" not in template
+)
+
+
+@dataclass(frozen=True, slots=True)
+class GrpcErrorInfo:
+    """User-facing description of a failed gRPC call.
+
+    Attributes:
+        error: User-friendly error message
+        hint: Actionable hint for resolving the issue
+        grpc_status: The gRPC status code name
+    """
+    error: str
+    hint: str
+    grpc_status: str
+
+    def to_dict(self) -> dict[str, str]:
+        """Convert to a (new, mutable) dictionary."""
+        return {"error": self.error, "hint": self.hint, "grpc_status": self.grpc_status}
+
+
+_UNKNOWN_HINT = "Check Velociraptor server logs for details."
+
+
+@lru_cache(maxsize=256)
+def _static_error_info(code: grpc.StatusCode, operation: str) -> GrpcErrorInfo:
+    """Build (and cache) the info for status codes whose message has no details."""
+    template, hint = _STATUS_TABLE[code]
+    return GrpcErrorInfo(template.format(operation=operation), hint, code.name)
+
+
+def grpc_error_info(error: grpc.RpcError, operation: str) -> GrpcErrorInfo:
+    """Describe a gRPC error with a user-friendly message and hint.
+
+    Infos without server-supplied details are cached per (code, operation),
+    so repeated failures (e.g. during an outage) reuse the same instance.
+
+    Args:
+        error: The gRPC error
+        operation: Description of the operation that failed (e.g., "query execution")
+
+    Returns:
+        Immutable error info
+    """
+    try:
+        code = error.code()
+    except Exception:
+        # If we can't get the code, return a generic error
+        return GrpcErrorInfo(f"Unknown error during {operation}", _UNKNOWN_HINT, "UNKNOWN")
+
+    if code in _STATIC_CODES:
+        return _static_error_info(code, operation)
+
+    status_name = code.name
+    template, hint = _STATUS_TABLE.get(code, _DEFAULT_ENTRY)
+    details_fn = getattr(error, "details", None)
+    details = details_fn() if details_fn is not None else ""
+
+    return GrpcErrorInfo(
+        template.format(operation=operation, details=details, status=status_name),
+        hint,
+        status_name,
+    )
 
 
 def map_grpc_error(error: grpc.RpcError, operation: str) -> dict[str, str]:
@@ -48,116 +268,201 @@ def map_grpc_error(error: grpc.RpcError, operation: str) -> dict[str, str]:
         - hint: Actionable hint for resolving the issue
         - grpc_status: The gRPC status code name
     """
-    try:
-        code = error.code()
-    except Exception:
-        # If we can't get the code, return a generic error
-        return {
-            "error": f"Unknown error during {operation}",
-            "hint": "Check Velociraptor server logs for details.",
-            "grpc_status": "UNKNOWN",
-        }
-
-    status_name = code.name if hasattr(code, "name") else "UNKNOWN"
-
-    # Map status codes to user-friendly messages
-    if code == grpc.StatusCode.UNAVAILABLE:
-        return {
-            "error": f"Velociraptor server is unavailable during {operation}",
-            "hint": (
-                "1. Check if the Velociraptor server is running\n"
-                "2. Verify network connectivity\n"
-                "3. Check server URL in configuration"
-            ),
-            "grpc_status": status_name,
-        }
-
-    elif code == grpc.StatusCode.DEADLINE_EXCEEDED:
-        return {
-            "error": f"Operation timeout during {operation}",
-            "hint": (
-                "1. Query took too long to execute\n"
-                "2. Try adding LIMIT clause to reduce result set\n"
-                "3. Increase timeout parameter if needed\n"
-                "4. Check if server is under high load"
-            ),
-            "grpc_status": status_name,
-        }
-
-    elif code == grpc.StatusCode.NOT_FOUND:
-        return {
-            "error": f"Resource not found during {operation}",
-            "hint": (
-                "1. Verify the ID is correct (client_id, hunt_id, flow_id, etc.)\n"
-                "2. Use list_* tools to find valid IDs\n"
-                "3. Check if resource was deleted"
-            ),
-            "grpc_status": status_name,
-        }
-
-    elif code == grpc.StatusCode.INVALID_ARGUMENT:
-        details = error.details() if hasattr(error, "details") else ""
-        return {
-            "error": f"Invalid argument during {operation}: {details}",
-            "hint": (
-                "1. Check parameter formats (client_id starts with 'C.', etc.)\n"
-                "2. Verify VQL syntax if running a query\n"
-                "3. Use vql_help tool for VQL syntax guidance"
-            ),
-            "grpc_status": status_name,
-        }
-
-    elif code == grpc.StatusCode.UNAUTHENTICATED:
-        return {
-            "error": f"Authentication failed during {operation}",
-            "hint": (
-                "1. Check API configuration file path\n"
-                "2. Verify certificate validity\n"
-                "3. Ensure VELOCIRAPTOR_CONFIG environment variable is set correctly"
-            ),
-            "grpc_status": status_name,
-        }
-
-    elif code == grpc.StatusCode.PERMISSION_DENIED:
-        return {
-            "error": f"Permission denied during {operation}",
-            "hint": (
-                "1. Check API client permissions in Velociraptor\n"
-                "2. Verify you have necessary roles for this operation\n"
-                "3. Contact Velociraptor administrator if needed"
-            ),
-            "grpc_status": status_name,
-        }
-
-    elif code == grpc.StatusCode.INTERNAL:
-        details = error.details() if hasattr(error, "details") else ""
-        return {
-            "error": f"Internal server error during {operation}: {details}",
-            "hint": (
-                "1. Check Velociraptor server logs for details\n"
-                "2. This may indicate a bug in the server\n"
-                "3. Try simplifying the query if using VQL"
-            ),
-            "grpc_status": status_name,
-        }
-
-    elif code == grpc.StatusCode.RESOURCE_EXHAUSTED:
-        return {
-            "error": f"Server resources exhausted during {operation}",
-            "hint": (
-                "1. Server is under heavy load\n"
-                "2. Try again after a delay\n"
-                "3. Reduce query complexity or result set size\n"
-                "4. Contact administrator if issue persists"
-            ),
-            "grpc_status": status_name,
-        }
-
-    else:
-        # Default fallback for unmapped status codes
-        details = error.details() if hasattr(error, "details") else ""
-        return {
-            "error": f"gRPC error during {operation}: {status_name} - {details}",
-            "hint": "Check server logs or contact administrator for details.",
-            "grpc_status": status_name,
-        }
+    return grpc_error_info(error, operation).to_dict()
+
+
+# Status codes that indicate the server itself is unreachable. Not
+# DEADLINE_EXCEEDED: user-supplied VQL can legitimately run past its deadline,
+# and a few slow queries must not cut every tool off from a healthy server.
+_BREAKER_FAILURE_CODES: frozenset[grpc.StatusCode] = frozenset((
+    _UNAVAILABLE,
+))
+
+
+class CircuitOpenError(grpc.RpcError):
+    """Raised instead of issuing an RPC while the circuit breaker is open.
+
+    Reports UNAVAILABLE so callers handle it exactly like a real outage
+    (e.g. via map_grpc_error).
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Circuit breaker open, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+    def code(self) -> grpc.StatusCode:
+        return _UNAVAILABLE
+
+    def details(self) -> str:
+        return (
+            "Circuit breaker open after repeated connection failures; "
+            f"next attempt in {self.retry_after:.1f}s"
+        )
+
+
+class GrpcCircuitBreaker:
+    """Client-side circuit breaker for Velociraptor RPCs.
+
+    Counts UNAVAILABLE failures over a rolling window and opens once enough
+    requests fail, so calls fail immediately with CircuitOpenError instead of
+    each waiting out a connection timeout. After the sleep window exactly one
+    trial call is let through (half-open) while every other caller keeps
+    failing fast: success closes the circuit, failure re-opens it.
+    Outcomes are only counted against the state their call was admitted in,
+    so a slow call from before a transition cannot decide the trial or
+    re-trip an open circuit. Thread-safe.
+
+    Attributes:
+        state: Current state ("closed", "open", or "half_open")
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        volume_threshold: int = 5,
+        error_threshold_percentage: int = 50,
+        sleep_window: float = 10.0,
+        rolling_window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the circuit breaker.
+
+        Args:
+            volume_threshold: Minimum requests in the window before tripping
+            error_threshold_percentage: Failure percentage that trips the circuit
+            sleep_window: Seconds to stay open before allowing a trial call
+            rolling_window: Seconds over which requests and failures are counted
+            clock: Monotonic time source (overridable for tests)
+        """
+        self.volume_threshold = volume_threshold
+        self.error_threshold_percentage = error_threshold_percentage
+        self.sleep_window = sleep_window
+        self.rolling_window = rolling_window
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        # Bumped on every state change; calls carry the value they were admitted under
+        self._generation = 0
+        self._window_start = clock()
+        self._requests = 0
+        self._failures = 0
+
+    def before_call(self) -> int:
+        """Check whether a call may proceed.
+
+        A caller that is let through must report its outcome with
+        record_success() or record_error(), passing back the returned token.
+
+        Returns:
+            Token identifying the state the call was admitted in
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with the
+                trial call still in flight
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return self._generation
+            if self.state == self.HALF_OPEN:
+                raise CircuitOpenError(self.sleep_window)
+            elapsed = self._clock() - self.opened_at
+            if elapsed < self.sleep_window:
+                raise CircuitOpenError(self.sleep_window - elapsed)
+            self.state = self.HALF_OPEN
+            self._generation += 1
+            return self._generation
+
+    def record_success(self, token: int) -> None:
+        """Record a call that reached the server.
+
+        Args:
+            token: The value before_call() returned for this call
+        """
+        self._record(token, failed=False)
+
+    def record_error(self, error: BaseException, token: int) -> None:
+        """Record a failed call; only connectivity failures count against the server.
+
+        Args:
+            error: The exception the call raised
+            token: The value before_call() returned for this call
+        """
+        failed = False
+        if isinstance(error, grpc.RpcError) and not isinstance(error, CircuitOpenError):
+            try:
+                failed = error.code() in _BREAKER_FAILURE_CODES
+            except AttributeError:
+                failed = False
+        self._record(token, failed=failed)
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Invoke fn through the circuit breaker.
+
+        Args:
+            fn: The RPC callable
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The result of fn
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        token = self.before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            # Always report, so an interrupted trial call cannot wedge the breaker
+            self.record_error(e, token)
+            raise
+        self.record_success(token)
+        return result
+
+    def _record(self, token: int, failed: bool) -> None:
+        """Update counters and state with the outcome of a call."""
+        with self._lock:
+            if token != self._generation:
+                # Admitted before the last state change; its outcome is stale
+                return
+            now = self._clock()
+
+            if self.state == self.HALF_OPEN:
+                if failed:
+                    self._trip(now)
+                else:
+                    self._reset(now)
+                return
+
+            if now - self._window_start > self.rolling_window:
+                self._reset(now)
+
+            self._requests += 1
+            if failed:
+                self._failures += 1
+
+            if (
+                self._requests >= self.volume_threshold
+                and self._failures * 100 >= self.error_threshold_percentage * self._requests
+            ):
+                self._trip(now)
+
+    def _trip(self, now: float) -> None:
+        """Open the circuit."""
+        self.state = self.OPEN
+        self.opened_at = now
+        self._generation += 1
+
+    def _reset(self, now: float) -> None:
+        """Close the circuit and start a fresh counting window."""
+        if self.state != self.CLOSED:
+            self.state = self.CLOSED
+            self._generation += 1
+        self._window_start = now
+        self._requests = 0
+        self._failures = 0
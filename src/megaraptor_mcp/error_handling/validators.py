@@ -2,10 +2,65 @@
 Input validation functions for Velociraptor MCP tools.
 
 Provides validation for common parameters like client IDs, limits, hunt IDs,
-flow IDs, and basic VQL syntax checking.
-"""
+flow IDs, and basic VQL syntax checking, plus quoting of VQL string values.
 
+Successful validations are memoized (failures raise and are never cached),
+since a session typically reuses the same few IDs on every tool call.
+"""
 
+import re
+from functools import lru_cache
+
+# Cache sizes for memoized validators
+_ID_CACHE_SIZE = 4096
+_VQL_CACHE_SIZE = 256
+
+# Case-insensitive SELECT search, run in C without building an uppercased copy
+_SELECT_RE = re.compile("SELECT", re.IGNORECASE)
+
+# Backslash-escapes for the characters that end or escape a quoted VQL string
+_VQL_STRING_ESCAPES = str.maketrans({"\\": "\\\\", "'": "\\'"})
+
+# Error messages for Velociraptor ID validation, formatted only on failure
+_CLIENT_ID_EMPTY_ERR = (
+    "Client ID cannot be empty. "
+    "Hint: Use list_clients tool to find valid client IDs."
+)
+_CLIENT_ID_FORMAT_ERR = (
+    "Invalid client ID format: '{value}'. "
+    "Must start with 'C.' (e.g., 'C.1234567890abcdef'). "
+    "Hint: Use list_clients tool to find valid client IDs."
+)
+_HUNT_ID_EMPTY_ERR = (
+    "Hunt ID cannot be empty. "
+    "Hint: Use list_hunts tool to find valid hunt IDs."
+)
+_HUNT_ID_FORMAT_ERR = (
+    "Invalid hunt ID format: '{value}'. "
+    "Must start with 'H.' (e.g., 'H.1234567890'). "
+    "Hint: Use list_hunts tool to find valid hunt IDs."
+)
+_FLOW_ID_EMPTY_ERR = (
+    "Flow ID cannot be empty. "
+    "Hint: Use list_flows tool to find valid flow IDs."
+)
+_FLOW_ID_FORMAT_ERR = (
+    "Invalid flow ID format: '{value}'. "
+    "Must start with 'F.' (e.g., 'F.1234567890'). "
+    "Hint: Use list_flows tool to find valid flow IDs."
+)
+
+
+def _validate_prefixed_id(value: str, prefix: str, empty_err: str, format_err: str) -> str:
+    """Check that an ID carries its two-character type prefix (e.g. 'C.')."""
+    if not value:
+        raise ValueError(empty_err)
+    if value[:2] != prefix:
+        raise ValueError(format_err.format(value=value))
+    return value
+
+
+@lru_cache(maxsize=_ID_CACHE_SIZE)
 def validate_client_id(client_id: str) -> str:
     """Validate a Velociraptor client ID.
 
@@ -18,20 +73,9 @@ def validate_client_id(client_id: str) -> str:
     Raises:
         ValueError: If the client ID is invalid
     """
-    if not client_id:
-        raise ValueError(
-            "Client ID cannot be empty. "
-            "Hint: Use list_clients tool to find valid client IDs."
-        )
-
-    if not client_id.startswith("C."):
-        raise ValueError(
-            f"Invalid client ID format: '{client_id}'. "
-            "Must start with 'C.' (e.g., 'C.1234567890abcdef'). "
-            "Hint: Use list_clients tool to find valid client IDs."
-        )
-
-    return client_id
+    return _validate_prefixed_id(
+        client_id, "C.", _CLIENT_ID_EMPTY_ERR, _CLIENT_ID_FORMAT_ERR
+    )
 
 
 def validate_limit(limit: int, min_val: int = 1, max_val: int = 10000) -> int:
@@ -63,6 +107,7 @@ def validate_limit(limit: int, min_val: int = 1, max_val: int = 10000) -> int:
     return limit
 
 
+@lru_cache(maxsize=_ID_CACHE_SIZE)
 def validate_hunt_id(hunt_id: str) -> str:
     """Validate a Velociraptor hunt ID.
 
@@ -75,22 +120,12 @@ def validate_hunt_id(hunt_id: str) -> str:
     Raises:
         ValueError: If the hunt ID is invalid
     """
-    if not hunt_id:
-        raise ValueError(
-            "Hunt ID cannot be empty. "
-            "Hint: Use list_hunts tool to find valid hunt IDs."
-        )
-
-    if not hunt_id.startswith("H."):
-        raise ValueError(
-            f"Invalid hunt ID format: '{hunt_id}'. "
-            "Must start with 'H.' (e.g., 'H.1234567890'). "
-            "Hint: Use list_hunts tool to find valid hunt IDs."
-        )
-
-    return hunt_id
+    return _validate_prefixed_id(
+        hunt_id, "H.", _HUNT_ID_EMPTY_ERR, _HUNT_ID_FORMAT_ERR
+    )
 
 
+@lru_cache(maxsize=_ID_CACHE_SIZE)
 def validate_flow_id(flow_id: str) -> str:
     """Validate a Velociraptor flow ID.
 
@@ -103,22 +138,12 @@ def validate_flow_id(flow_id: str) -> str:
     Raises:
         ValueError: If the flow ID is invalid
     """
-    if not flow_id:
-        raise ValueError(
-            "Flow ID cannot be empty. "
-            "Hint: Use list_flows tool to find valid flow IDs."
-        )
-
-    if not flow_id.startswith("F."):
-        raise ValueError(
-            f"Invalid flow ID format: '{flow_id}'. "
-            "Must start with 'F.' (e.g., 'F.1234567890'). "
-            "Hint: Use list_flows tool to find valid flow IDs."
-        )
-
-    return flow_id
+    return _validate_prefixed_id(
+        flow_id, "F.", _FLOW_ID_EMPTY_ERR, _FLOW_ID_FORMAT_ERR
+    )
 
 
+@lru_cache(maxsize=_VQL_CACHE_SIZE)
 def validate_vql_syntax_basics(query: str) -> str:
     """Perform basic VQL syntax validation.
 
@@ -131,24 +156,26 @@ def validate_vql_syntax_basics(query: str) -> str:
     Raises:
         ValueError: If basic syntax issues are detected
     """
-    if not query or not query.strip():
+    # Find the last non-whitespace character without copying the query
+    end = len(query) if query else 0
+    while end and query[end - 1].isspace():
+        end -= 1
+
+    if not end:
         raise ValueError(
             "VQL query cannot be empty. "
             "Hint: Use vql_help tool to learn VQL syntax."
         )
 
-    query_stripped = query.strip()
-
     # VQL doesn't use semicolons
-    if query_stripped.endswith(";"):
+    if query[end - 1] == ";":
         raise ValueError(
             "VQL queries should not end with a semicolon (;). "
             "Hint: Unlike SQL, VQL doesn't use semicolons as statement terminators."
         )
 
     # Basic check for SELECT keyword
-    query_upper = query_stripped.upper()
-    if "SELECT" not in query_upper:
+    if not _SELECT_RE.search(query, 0, end):
         raise ValueError(
             "VQL query must contain a SELECT statement. "
             "Hint: VQL is a query language based on SQL-like syntax. "
@@ -156,3 +183,18 @@ def validate_vql_syntax_basics(query: str) -> str:
         )
 
     return query
+
+
+def vql_string(value: str) -> str:
+    """Quote a value as a single-quoted VQL string literal.
+
+    Backslashes and single quotes are escaped in one pass, so the value
+    cannot end the literal early or inject VQL.
+
+    Args:
+        value: The raw string to embed in a query
+
+    Returns:
+        The quoted literal, including the surrounding quotes
+    """
+    return "'" + value.translate(_VQL_STRING_ESCAPES) + "'"
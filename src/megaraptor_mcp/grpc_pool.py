@@ -0,0 +1,106 @@
+"""
+gRPC channel pooling for the Velociraptor API.
+
+A single channel multiplexes every call over one HTTP/2 connection, so a slow
+query can hold up everything queued behind it. The pool keeps several
+independent connections and hands them out round-robin.
+"""
+
+import itertools
+from typing import Any, Callable, Optional, TypeVar
+
+import grpc
+
+T = TypeVar("T")
+
+DEFAULT_POOL_SIZE = 4
+
+
+def _is_resource_exhausted(error: grpc.RpcError) -> bool:
+    """Check whether an RPC error was a RESOURCE_EXHAUSTED rejection."""
+    try:
+        return error.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+    except AttributeError:
+        return False
+
+
+class ChannelPool:
+    """Fixed-size pool of secure gRPC channels with round-robin dispatch.
+
+    Each channel gets its own subchannel pool and a distinguishing
+    ``grpc.channel_id`` argument so gRPC does not collapse them back onto
+    one shared connection.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        credentials: grpc.ChannelCredentials,
+        size: int = DEFAULT_POOL_SIZE,
+        options: Optional[list[tuple[str, Any]]] = None,
+    ):
+        """Open the pooled channels.
+
+        Args:
+            target: Server address as host:port
+            credentials: TLS credentials shared by every channel
+            size: Number of channels to open
+            options: Channel arguments applied to every channel
+
+        Raises:
+            ValueError: If size is less than 1
+        """
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {size}")
+
+        base_options = list(options or [])
+        self._channels: list[grpc.Channel] = [
+            grpc.secure_channel(
+                target,
+                credentials,
+                options=base_options + [
+                    ("grpc.use_local_subchannel_pool", 1),
+                    ("grpc.channel_id", i),
+                ],
+            )
+            for i in range(size)
+        ]
+        self._next = itertools.cycle(range(size))
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    @property
+    def channels(self) -> list[grpc.Channel]:
+        """The pooled channels, in dispatch order."""
+        return self._channels
+
+    def pick(self) -> grpc.Channel:
+        """Return the next channel in round-robin order."""
+        return self._channels[next(self._next)]
+
+    def call(self, fn: Callable[[grpc.Channel], T]) -> T:
+        """Run ``fn`` on a pooled channel, moving on when one is saturated.
+
+        RESOURCE_EXHAUSTED is retried immediately on the next channel, at
+        most once per channel. Any other error, or exhausting every channel,
+        is raised so the caller's own retry policy applies.
+
+        Args:
+            fn: Callable taking the channel to issue the RPC on
+
+        Returns:
+            Whatever ``fn`` returns
+        """
+        for _ in range(len(self._channels) - 1):
+            try:
+                return fn(self.pick())
+            except grpc.RpcError as e:
+                if not _is_resource_exhausted(e):
+                    raise
+        return fn(self.pick())
+
+    def close(self) -> None:
+        """Close every pooled channel."""
+        for channel in self._channels:
+            channel.close()
@@ -4,15 +4,170 @@ MCP Prompts for DFIR workflows.
 Provides pre-built prompts for common digital forensics and incident response workflows.
 """
 
+import inspect
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from typing import Callable, Mapping
+
 from ..server import mcp
 
+# Rendered prompts kept per prompt function, keyed by argument values
+_PROMPT_CACHE_SIZE = 256
+
+
+def _cached_prompt(render: Callable[..., str]) -> Callable[..., str]:
+    """Expose a prompt renderer as an async prompt that memoizes its text.
+
+    Prompt arguments are plain strings, so repeat invocations with the same
+    values (e.g. the same client_id across a session) return the cached text.
+    Prompts whose arguments all have defaults are rendered once up front.
+    """
+    cached = lru_cache(maxsize=_PROMPT_CACHE_SIZE)(render)
+
+    # FastMCP passes validated arguments, defaults included, as keywords
+    defaults = {
+        name: param.default
+        for name, param in inspect.signature(render).parameters.items()
+    }
+    if inspect.Parameter.empty not in defaults.values():
+        cached(**defaults)
+
+    @wraps(render)
+    async def prompt(*args, **kwargs) -> str:
+        return cached(*args, **kwargs)
+
+    prompt.cache_info = cached.cache_info
+    prompt.cache_clear = cached.cache_clear
+    return prompt
+
+
+# =========================================================================
+# Artifact Recommendations
+# =========================================================================
+
+_TRIAGE_ARTIFACTS: Mapping[str, tuple[str, ...]] = MappingProxyType({
+    "malware": ("Windows.System.Pslist", "Windows.Detection.Autoruns", "Windows.System.Services", "Windows.Network.Netstat"),
+    "intrusion": ("Windows.EventLogs.Evtx", "Windows.System.Users", "Windows.Network.Connections", "Windows.Detection.Autoruns"),
+    "data_exfil": ("Windows.Network.Netstat", "Windows.Forensics.Usn", "Windows.System.Pslist", "Windows.EventLogs.RDPAuth"),
+    "ransomware": ("Windows.Detection.Ransomware", "Windows.System.Pslist", "Windows.Forensics.Usn", "Windows.Detection.Autoruns"),
+    "unknown": ("Windows.KapeFiles.Targets", "Windows.System.Pslist", "Windows.Network.Netstat", "Windows.Detection.Autoruns"),
+})
+
+_DEPLOY_TRIAGE_ARTIFACTS: Mapping[str, tuple[str, ...]] = MappingProxyType({
+    "ransomware": (
+        "Windows.Detection.Ransomware",
+        "Windows.Forensics.Usn",
+        "Windows.System.Pslist",
+        "Windows.Detection.Autoruns",
+        "Windows.Network.Netstat",
+    ),
+    "intrusion": (
+        "Windows.EventLogs.Evtx",
+        "Windows.Detection.Autoruns",
+        "Windows.System.Pslist",
+        "Windows.Network.Netstat",
+        "Windows.Forensics.SRUM",
+    ),
+    "malware": (
+        "Windows.System.Pslist",
+        "Windows.Detection.Autoruns",
+        "Windows.Forensics.Prefetch",
+        "Windows.Detection.Amcache",
+        "Windows.Network.Netstat",
+    ),
+    "data_breach": (
+        "Windows.Forensics.Usn",
+        "Windows.EventLogs.Evtx",
+        "Windows.Network.Netstat",
+        "Windows.Forensics.SRUM",
+        "Windows.System.Pslist",
+    ),
+    "unknown": (
+        "Windows.KapeFiles.Targets",
+        "Windows.System.Pslist",
+        "Windows.Network.Netstat",
+        "Windows.Detection.Autoruns",
+    ),
+})
+
+_OFFLINE_ARTIFACTS: Mapping[str, Mapping[str, tuple[str, ...]]] = MappingProxyType({
+    "windows": MappingProxyType({
+        "triage": ("Windows.KapeFiles.Targets", "Windows.System.Pslist", "Windows.Network.Netstat"),
+        "full": ("Windows.KapeFiles.Targets", "Windows.System.Pslist", "Windows.Network.Netstat", "Windows.EventLogs.Evtx", "Windows.Forensics.SRUM"),
+        "memory": ("Windows.Memory.Acquisition",),
+    }),
+    "linux": MappingProxyType({
+        "triage": ("Linux.Sys.Pslist", "Linux.Network.Netstat", "Linux.Sys.Users"),
+        "full": ("Linux.Sys.Pslist", "Linux.Network.Netstat", "Linux.Sys.Users", "Linux.Sys.Crontab", "Linux.Forensics.Journal"),
+        "memory": ("Linux.Memory.Acquisition",),
+    }),
+    "macos": MappingProxyType({
+        "triage": ("MacOS.Sys.Pslist", "MacOS.Network.Netstat", "MacOS.Sys.Users"),
+        "full": ("MacOS.Sys.Pslist", "MacOS.Network.Netstat", "MacOS.Sys.Users", "MacOS.Sys.LaunchAgents"),
+        "memory": ("MacOS.Memory.Acquisition",),
+    }),
+})
+
+
+def _render_artifacts(artifacts: tuple[str, ...]) -> tuple[str, str]:
+    """Render artifacts as (Python list literal, markdown bullets)."""
+    return str(list(artifacts)), "\n".join("- " + a for a in artifacts)
+
+
+# Artifact lists pre-rendered into the text the prompts embed
+_TRIAGE_ARTIFACT_TEXT = {k: str(list(v)) for k, v in _TRIAGE_ARTIFACTS.items()}
+_DEPLOY_TRIAGE_TEXT = {
+    k: _render_artifacts(v) for k, v in _DEPLOY_TRIAGE_ARTIFACTS.items()
+}
+_OFFLINE_TEXT = {
+    os_name: {k: _render_artifacts(v) for k, v in sets.items()}
+    for os_name, sets in _OFFLINE_ARTIFACTS.items()
+}
+
+# Per-incident priority actions. The rendered block keeps one line per
+# incident type, blank except for the selected one.
+_PRIORITY_ACTIONS = {
+    "ransomware": "- Look for encryption processes and ransom notes",
+    "intrusion": "- Identify initial access vector and lateral movement",
+    "malware": "- Locate malware binaries and analyze behavior",
+    "data_breach": "- Identify accessed data and exfiltration methods",
+}
+_PRIORITY_ACTION_BLOCKS = {
+    selected: "\n".join(
+        line if incident_type == selected else ""
+        for incident_type, line in _PRIORITY_ACTIONS.items()
+    )
+    for selected in _PRIORITY_ACTIONS
+}
+_NO_PRIORITY_ACTIONS = "\n" * (len(_PRIORITY_ACTIONS) - 1)
+
+# Offline collector run instructions, Windows block first then Linux/macOS
+_WINDOWS_STEPS = (
+    "**Windows:**",
+    "1. Extract the ZIP file",
+    "2. Right-click 'collect.bat' and Run as Administrator",
+    "3. Wait for collection to complete",
+)
+_POSIX_STEPS = (
+    "**Linux/macOS:**",
+    "1. Extract: tar -xzf velociraptor-collector-*.tar.gz",
+    "2. Run: sudo ./collect.sh",
+    "3. Wait for collection to complete",
+)
+_BLANK_STEPS = ("",) * len(_POSIX_STEPS)
+_POSIX_RUN_STEPS = "\n".join(_BLANK_STEPS) + "\n\n" + "\n".join(_POSIX_STEPS)
+_RUN_STEPS = {
+    "windows": "\n".join(_WINDOWS_STEPS) + "\n\n" + "\n".join(_BLANK_STEPS),
+}
+
 
 # =========================================================================
 # Investigation Prompts
 # =========================================================================
 
 @mcp.prompt()
-async def investigate_endpoint(client_id: str) -> str:
+@_cached_prompt
+def investigate_endpoint(client_id: str) -> str:
     """Start a comprehensive investigation on a specific endpoint.
 
     Guides through system interrogation, process analysis, network connections,
@@ -61,7 +216,8 @@ Please start with step 1 and guide me through each phase, highlighting any findi
 
 
 @mcp.prompt()
-async def threat_hunt(indicators: str, hunt_type: str = "custom") -> str:
+@_cached_prompt
+def threat_hunt(indicators: str, hunt_type: str = "custom") -> str:
     """Create and execute a threat hunting campaign across multiple endpoints.
 
     Helps build hunts for specific IOCs, TTPs, or suspicious behaviors.
@@ -113,7 +269,8 @@ Let's start by analyzing the indicators and determining the best hunting strateg
 
 
 @mcp.prompt()
-async def triage_incident(client_id: str, incident_type: str = "unknown") -> str:
+@_cached_prompt
+def triage_incident(client_id: str, incident_type: str = "unknown") -> str:
     """Rapid incident triage workflow.
 
     Quickly collects critical forensic artifacts for initial assessment and scoping.
@@ -122,15 +279,7 @@ async def triage_incident(client_id: str, incident_type: str = "unknown") -> str
         client_id: The Velociraptor client ID of the affected endpoint
         incident_type: Type of incident - 'malware', 'intrusion', 'data_exfil', 'ransomware', or 'unknown'
     """
-    artifact_recommendations = {
-        "malware": ["Windows.System.Pslist", "Windows.Detection.Autoruns", "Windows.System.Services", "Windows.Network.Netstat"],
-        "intrusion": ["Windows.EventLogs.Evtx", "Windows.System.Users", "Windows.Network.Connections", "Windows.Detection.Autoruns"],
-        "data_exfil": ["Windows.Network.Netstat", "Windows.Forensics.Usn", "Windows.System.Pslist", "Windows.EventLogs.RDPAuth"],
-        "ransomware": ["Windows.Detection.Ransomware", "Windows.System.Pslist", "Windows.Forensics.Usn", "Windows.Detection.Autoruns"],
-        "unknown": ["Windows.KapeFiles.Targets", "Windows.System.Pslist", "Windows.Network.Netstat", "Windows.Detection.Autoruns"],
-    }
-
-    recommended_artifacts = artifact_recommendations.get(incident_type, artifact_recommendations["unknown"])
+    recommended_artifacts = _TRIAGE_ARTIFACT_TEXT.get(incident_type, _TRIAGE_ARTIFACT_TEXT["unknown"])
 
     return f"""URGENT: Incident triage needed for endpoint {client_id}
 
@@ -180,7 +329,8 @@ Let's start immediately with the urgent collection. Time is critical."""
 
 
 @mcp.prompt()
-async def malware_analysis(client_id: str, target: str) -> str:
+@_cached_prompt
+def malware_analysis(client_id: str, target: str) -> str:
     """Analyze potentially malicious files or processes.
 
     Guides through file analysis, process inspection, and behavioral indicators.
@@ -240,7 +390,8 @@ Let's start by identifying and collecting information about the target."""
 
 
 @mcp.prompt()
-async def lateral_movement(scope: str, timeframe: str = "24h") -> str:
+@_cached_prompt
+def lateral_movement(scope: str, timeframe: str = "24h") -> str:
     """Detect and investigate lateral movement indicators.
 
     Checks for RDP, SMB, WMI, PowerShell remoting, and other lateral movement techniques.
@@ -323,7 +474,8 @@ Let's start by setting up the appropriate hunts to detect these lateral movement
 # =========================================================================
 
 @mcp.prompt()
-async def rapid_ir_deployment(target_count: str = "unknown", environment: str = "mixed") -> str:
+@_cached_prompt
+def rapid_ir_deployment(target_count: str = "unknown", environment: str = "mixed") -> str:
     """Guided workflow for rapid Velociraptor deployment during an active incident.
 
     Gets you from zero to collecting artifacts in under 5 minutes.
@@ -392,51 +544,17 @@ Let's start immediately with Phase 1. Deploy the server now."""
 
 
 @mcp.prompt()
-async def deploy_and_triage(incident_type: str, affected_systems: str) -> str:
+@_cached_prompt
+def deploy_and_triage(incident_type: str, affected_systems: str) -> str:
     """Deploy Velociraptor and immediately begin triage collection on affected systems.
 
     Args:
         incident_type: Type of incident - 'ransomware', 'intrusion', 'malware', 'data_breach', or 'unknown'
         affected_systems: List of affected system hostnames or IPs (comma-separated)
     """
-    artifact_sets = {
-        "ransomware": [
-            "Windows.Detection.Ransomware",
-            "Windows.Forensics.Usn",
-            "Windows.System.Pslist",
-            "Windows.Detection.Autoruns",
-            "Windows.Network.Netstat",
-        ],
-        "intrusion": [
-            "Windows.EventLogs.Evtx",
-            "Windows.Detection.Autoruns",
-            "Windows.System.Pslist",
-            "Windows.Network.Netstat",
-            "Windows.Forensics.SRUM",
-        ],
-        "malware": [
-            "Windows.System.Pslist",
-            "Windows.Detection.Autoruns",
-            "Windows.Forensics.Prefetch",
-            "Windows.Detection.Amcache",
-            "Windows.Network.Netstat",
-        ],
-        "data_breach": [
-            "Windows.Forensics.Usn",
-            "Windows.EventLogs.Evtx",
-            "Windows.Network.Netstat",
-            "Windows.Forensics.SRUM",
-            "Windows.System.Pslist",
-        ],
-        "unknown": [
-            "Windows.KapeFiles.Targets",
-            "Windows.System.Pslist",
-            "Windows.Network.Netstat",
-            "Windows.Detection.Autoruns",
-        ],
-    }
-
-    recommended = artifact_sets.get(incident_type, artifact_sets["unknown"])
+    recommended, recommended_bullets = _DEPLOY_TRIAGE_TEXT.get(
+        incident_type, _DEPLOY_TRIAGE_TEXT["unknown"]
+    )
 
     return f"""URGENT: Deploy Velociraptor and begin immediate triage.
 
@@ -478,7 +596,7 @@ check_agent_deployment(deployment_id)
 ### Step 4: Immediate Triage Collection
 
 For {incident_type} incidents, collect these artifacts urgently:
-{chr(10).join('- ' + a for a in recommended)}
+{recommended_bullets}
 
 Create an urgent collection:
 ```
@@ -500,42 +618,24 @@ Once collection completes:
 
 ## Priority Actions for {incident_type.upper()}
 
-{"- Look for encryption processes and ransom notes" if incident_type == "ransomware" else ""}
-{"- Identify initial access vector and lateral movement" if incident_type == "intrusion" else ""}
-{"- Locate malware binaries and analyze behavior" if incident_type == "malware" else ""}
-{"- Identify accessed data and exfiltration methods" if incident_type == "data_breach" else ""}
+{_PRIORITY_ACTION_BLOCKS.get(incident_type, _NO_PRIORITY_ACTIONS)}
 
 Let's begin deployment immediately. Time is critical."""
 
 
 @mcp.prompt()
-async def offline_collection_kit(target_os: str, collection_type: str = "triage") -> str:
+@_cached_prompt
+def offline_collection_kit(target_os: str, collection_type: str = "triage") -> str:
     """Generate a complete offline collection kit for air-gapped or isolated systems.
 
     Args:
         target_os: Target operating system - 'windows', 'linux', or 'macos'
         collection_type: Collection type - 'triage', 'full', 'memory', or 'custom'
     """
-    artifact_sets = {
-        "windows": {
-            "triage": ["Windows.KapeFiles.Targets", "Windows.System.Pslist", "Windows.Network.Netstat"],
-            "full": ["Windows.KapeFiles.Targets", "Windows.System.Pslist", "Windows.Network.Netstat", "Windows.EventLogs.Evtx", "Windows.Forensics.SRUM"],
-            "memory": ["Windows.Memory.Acquisition"],
-        },
-        "linux": {
-            "triage": ["Linux.Sys.Pslist", "Linux.Network.Netstat", "Linux.Sys.Users"],
-            "full": ["Linux.Sys.Pslist", "Linux.Network.Netstat", "Linux.Sys.Users", "Linux.Sys.Crontab", "Linux.Forensics.Journal"],
-            "memory": ["Linux.Memory.Acquisition"],
-        },
-        "macos": {
-            "triage": ["MacOS.Sys.Pslist", "MacOS.Network.Netstat", "MacOS.Sys.Users"],
-            "full": ["MacOS.Sys.Pslist", "MacOS.Network.Netstat", "MacOS.Sys.Users", "MacOS.Sys.LaunchAgents"],
-            "memory": ["MacOS.Memory.Acquisition"],
-        },
-    }
-
-    os_artifacts = artifact_sets.get(target_os, artifact_sets["windows"])
-    selected_artifacts = os_artifacts.get(collection_type, os_artifacts["triage"])
+    os_artifacts = _OFFLINE_TEXT.get(target_os, _OFFLINE_TEXT["windows"])
+    selected_artifacts, selected_bullets = os_artifacts.get(
+        collection_type, os_artifacts["triage"]
+    )
 
     return f"""I need to create an offline collection kit for air-gapped or isolated systems.
 
@@ -572,15 +672,7 @@ Transfer the generated package to the isolated system via:
 
 On the target system:
 
-{"**Windows:**" if target_os == "windows" else ""}
-{"1. Extract the ZIP file" if target_os == "windows" else ""}
-{"2. Right-click 'collect.bat' and Run as Administrator" if target_os == "windows" else ""}
-{"3. Wait for collection to complete" if target_os == "windows" else ""}
-
-{"**Linux/macOS:**" if target_os != "windows" else ""}
-{"1. Extract: tar -xzf velociraptor-collector-*.tar.gz" if target_os != "windows" else ""}
-{"2. Run: sudo ./collect.sh" if target_os != "windows" else ""}
-{"3. Wait for collection to complete" if target_os != "windows" else ""}
+{_RUN_STEPS.get(target_os, _POSIX_RUN_STEPS)}
 
 ### Step 4: Retrieve Results
 
@@ -596,7 +688,7 @@ Import the collected data into Velociraptor server or analyze directly:
 
 ## Artifacts Included for {collection_type.upper()} Collection
 
-{chr(10).join('- ' + a for a in selected_artifacts)}
+{selected_bullets}
 
 ## Security Considerations
 
@@ -0,0 +1,103 @@
+"""
+Result caching for read-only VQL queries.
+
+Artifact definitions change rarely (only when someone uploads or deletes an
+artifact), yet listing and fetching them is a full server round-trip. Their
+query results are cached here for a few minutes. Client metadata is cached
+for much shorter and dropped whenever a tool modifies a client; hunt
+listings likewise whenever a tool creates or modifies a hunt.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class QueryCache:
+    """Thread-safe cache with per-entry expiry and LRU eviction."""
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Seconds an entry stays valid
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds this entry stays valid (defaults to the cache's ttl)
+        """
+        with self._lock:
+            self._entries[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Results of artifact_definitions() queries
+ARTIFACT_CACHE = QueryCache(maxsize=256, ttl=300.0)
+
+# Client metadata responses from list_clients and get_client_info
+CLIENT_CACHE = QueryCache(maxsize=1024, ttl=30.0)
+
+# Hunt listings, dropped whenever a tool creates or modifies a hunt
+HUNT_CACHE = QueryCache(maxsize=64, ttl=5.0)
+
+
+def cached_query(client: Any, vql: str, cache: QueryCache = ARTIFACT_CACHE) -> list[dict[str, Any]]:
+    """Run a read-only query through a result cache.
+
+    The returned rows may be shared with other callers and must not be
+    mutated. Errors are raised as usual and never cached.
+
+    Args:
+        client: The Velociraptor client to query on a cache miss
+        vql: The fully-bound VQL query (used as the cache key)
+        cache: Cache to consult
+
+    Returns:
+        List of result rows as dictionaries
+    """
+    key = (id(client), vql)
+    rows = cache.get(key)
+    if rows is None:
+        rows = client.query(vql)
+        cache.put(key, rows)
+    return rows
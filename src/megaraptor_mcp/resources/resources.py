@@ -4,11 +4,76 @@ MCP Resources for browsing Velociraptor data.
 Provides browsable resources for clients, hunts, and artifacts.
 """
 
-import json
+import asyncio
+import sys
 from typing import Any
 
 from ..server import mcp
 from ..client import get_client
+from ..query_cache import ARTIFACT_CACHE, CLIENT_CACHE, HUNT_CACHE, cached_query
+from ..serialization import dumps
+from ..error_handling import validate_client_id, validate_hunt_id
+
+# Deployment support is optional; resolve it once rather than per request
+try:
+    from ..deployment.deployers import DockerDeployer, BinaryDeployer
+    HAS_DEPLOYERS = True
+    _DEPLOYERS_IMPORT_ERROR = ""
+except ImportError as e:
+    HAS_DEPLOYERS = False
+    _DEPLOYERS_IMPORT_ERROR = str(e)
+
+
+# VQL issued by the resource handlers. Values substituted into the quoted
+# literals go through _vql_literal() first so they cannot break out of them.
+_CLIENT_LIST_VQL = "SELECT client_id, os_info.hostname AS hostname, os_info.system AS os, labels, last_seen_at FROM clients() LIMIT 100"
+_CLIENT_DETAIL_VQL = "SELECT * FROM clients(client_id='{client_id}')"
+# The hunt list leaves out per-hunt stats; velociraptor://hunts/{hunt_id} has them
+_HUNT_LIST_VQL = "SELECT hunt_id, hunt_description, state, artifacts, create_time FROM hunts() LIMIT 50"
+_HUNT_RESULTS_VQL = "SELECT * FROM hunt_results(hunt_id='{hunt_id}') LIMIT 1000"
+# hunts(hunt_id=...) looks the hunt up directly instead of scanning every hunt
+_HUNT_DETAIL_VQL = "SELECT * FROM hunts(hunt_id='{hunt_id}')"
+_ARTIFACT_LIST_VQL = "SELECT name, description, type FROM artifact_definitions() LIMIT 500"
+_ARTIFACT_DETAIL_VQL = "SELECT * FROM artifact_definitions(names='{artifact_name}')"
+_SERVER_INFO_VQL = "SELECT * FROM info()"
+_SERVER_VERSION_VQL = "SELECT server_version() AS version FROM scope()"
+
+# Characters that would terminate or escape a quoted VQL string literal
+_VQL_QUOTE_CHARS = frozenset("'\"\\")
+
+
+# How long (seconds) a rendered list response is reused. Listings live in
+# the shared query caches, so the tools that modify clients, hunts or
+# artifacts invalidate them along with everything else they cache.
+_CLIENT_LIST_TTL = 5.0
+_HUNT_LIST_TTL = 5.0
+_ARTIFACT_LIST_TTL = 60.0
+
+
+# Prebuilt JSON for "not found" errors, used when the ID needs no escaping
+_ERROR_JSON = '{"error":"%s"}'
+_CLIENT_NOT_FOUND = "Client %s not found"
+_HUNT_NOT_FOUND = "Hunt %s not found"
+_ARTIFACT_NOT_FOUND = "Artifact %s not found"
+_DEPLOYMENT_NOT_FOUND = "Deployment %s not found"
+
+
+def _not_found(message: str, value: str) -> str:
+    """Render a not-found error, skipping the JSON encoder for plain IDs."""
+    if value.isprintable() and _VQL_QUOTE_CHARS.isdisjoint(value):
+        return _ERROR_JSON % (message % value)
+    return dumps({"error": message % value})
+
+
+def _vql_literal(value: str) -> str:
+    """Check that a value is safe to embed in a quoted VQL string literal.
+
+    Raises:
+        ValueError: If the value contains quote or escape characters
+    """
+    if not _VQL_QUOTE_CHARS.isdisjoint(value):
+        raise ValueError(f"Invalid characters in '{value}'")
+    return value
 
 
 # Resource handler functions
@@ -16,201 +81,217 @@ async def _handle_clients_resource(client: Any, path_parts: list[str]) -> str:
     """Handle clients resource requests."""
     if not path_parts or not path_parts[0]:
         # List all clients
-        vql = "SELECT client_id, os_info.hostname AS hostname, os_info.system AS os, labels, last_seen_at FROM clients() LIMIT 100"
-        results = client.query(vql)
-
-        return json.dumps({
-            "type": "client_list",
-            "count": len(results),
-            "clients": results,
-        }, indent=2, default=str)
+        text_key = ("resource_clients", id(client))
+        text = CLIENT_CACHE.get(text_key)
+        if text is None:
+            results = await asyncio.to_thread(client.query, _CLIENT_LIST_VQL)
+            text = dumps({
+                "type": "client_list",
+                "count": len(results),
+                "clients": results,
+            })
+            CLIENT_CACHE.put(text_key, text, ttl=_CLIENT_LIST_TTL)
+        return text
     else:
         # Get specific client
-        client_id = path_parts[0]
-        vql = f"SELECT * FROM clients(client_id='{client_id}')"
-        results = client.query(vql)
+        try:
+            client_id = _vql_literal(validate_client_id(path_parts[0]))
+        except ValueError as e:
+            return dumps({"error": str(e)})
+
+        results = await asyncio.to_thread(
+            client.query, _CLIENT_DETAIL_VQL.format(client_id=client_id)
+        )
 
         if not results:
-            return json.dumps({"error": f"Client {client_id} not found"})
+            return _not_found(_CLIENT_NOT_FOUND, client_id)
 
-        return json.dumps({
+        return dumps({
             "type": "client_detail",
             "client": results[0],
-        }, indent=2, default=str)
+        })
 
 
 async def _handle_hunts_resource(client: Any, path_parts: list[str]) -> str:
     """Handle hunts resource requests."""
     if not path_parts or not path_parts[0]:
         # List all hunts
-        vql = "SELECT hunt_id, hunt_description, state, artifacts, create_time, stats FROM hunts() LIMIT 50"
-        results = client.query(vql)
-
-        return json.dumps({
-            "type": "hunt_list",
-            "count": len(results),
-            "hunts": results,
-        }, indent=2, default=str)
+        text_key = ("resource_hunts", id(client))
+        text = HUNT_CACHE.get(text_key)
+        if text is None:
+            results = await asyncio.to_thread(client.query, _HUNT_LIST_VQL)
+            text = dumps({
+                "type": "hunt_list",
+                "count": len(results),
+                "hunts": results,
+            })
+            HUNT_CACHE.put(text_key, text, ttl=_HUNT_LIST_TTL)
+        return text
     else:
         # Get specific hunt
-        hunt_id = path_parts[0]
+        try:
+            hunt_id = _vql_literal(validate_hunt_id(path_parts[0]))
+        except ValueError as e:
+            return dumps({"error": str(e)})
 
         if len(path_parts) > 1 and path_parts[1] == "results":
             # Get hunt results
-            vql = f"SELECT * FROM hunt_results(hunt_id='{hunt_id}') LIMIT 1000"
-            results = client.query(vql)
+            results = await asyncio.to_thread(
+                client.query, _HUNT_RESULTS_VQL.format(hunt_id=hunt_id)
+            )
 
-            return json.dumps({
+            return dumps({
                 "type": "hunt_results",
                 "hunt_id": hunt_id,
                 "count": len(results),
                 "results": results,
-            }, indent=2, default=str)
+            })
         else:
             # Get hunt details
-            vql = f"SELECT * FROM hunts() WHERE hunt_id = '{hunt_id}'"
-            results = client.query(vql)
+            results = await asyncio.to_thread(
+                client.query, _HUNT_DETAIL_VQL.format(hunt_id=hunt_id)
+            )
 
             if not results:
-                return json.dumps({"error": f"Hunt {hunt_id} not found"})
+                return _not_found(_HUNT_NOT_FOUND, hunt_id)
 
-            return json.dumps({
+            return dumps({
                 "type": "hunt_detail",
                 "hunt": results[0],
-            }, indent=2, default=str)
+            })
 
 
 async def _handle_artifacts_resource(client: Any, path_parts: list[str]) -> str:
     """Handle artifacts resource requests."""
     if not path_parts or not path_parts[0]:
         # List all artifacts
-        vql = "SELECT name, description, type FROM artifact_definitions() LIMIT 500"
-        results = client.query(vql)
+        text_key = ("resource_artifacts", id(client))
+        text = ARTIFACT_CACHE.get(text_key)
+        if text is not None:
+            return text
+
+        results = await asyncio.to_thread(cached_query, client, _ARTIFACT_LIST_VQL)
 
         # Group by category (first part of name)
         categories = {}
         for artifact in results:
             name = artifact.get("name", "")
-            category = name.split(".")[0] if "." in name else "Other"
-            if category not in categories:
-                categories[category] = []
-            categories[category].append({
+            category, dot, _ = name.partition(".")
+            # A handful of categories repeat across hundreds of artifacts
+            category = sys.intern(category) if dot else "Other"
+            categories.setdefault(category, []).append({
                 "name": name,
                 "description": (artifact.get("description", "") or "")[:100],
                 "type": artifact.get("type", ""),
             })
 
-        return json.dumps({
+        text = dumps({
             "type": "artifact_list",
             "total_count": len(results),
             "categories": categories,
-        }, indent=2, default=str)
+        })
+        ARTIFACT_CACHE.put(text_key, text, ttl=_ARTIFACT_LIST_TTL)
+        return text
     else:
         # Get specific artifact
-        artifact_name = "/".join(path_parts)  # Handle nested names like Windows.System.Pslist
-        vql = f"SELECT * FROM artifact_definitions(names='{artifact_name}')"
-        results = client.query(vql)
+        try:
+            # Handle nested names like Windows.System.Pslist
+            artifact_name = _vql_literal("/".join(path_parts))
+        except ValueError as e:
+            return dumps({"error": str(e)})
+
+        results = await asyncio.to_thread(
+            cached_query, client, _ARTIFACT_DETAIL_VQL.format(artifact_name=artifact_name)
+        )
 
         if not results:
-            return json.dumps({"error": f"Artifact {artifact_name} not found"})
+            return _not_found(_ARTIFACT_NOT_FOUND, artifact_name)
 
-        return json.dumps({
+        return dumps({
             "type": "artifact_detail",
             "artifact": results[0],
-        }, indent=2, default=str)
+        })
 
 
 async def _handle_server_info_resource(client: Any) -> str:
     """Handle server info resource request."""
-    vql = "SELECT * FROM info()"
-    results = client.query(vql)
+    # Fetch server info and version in one round-trip
+    results, version_results = await asyncio.to_thread(
+        client.query_batch, [_SERVER_INFO_VQL, _SERVER_VERSION_VQL]
+    )
 
-    # Get server version and other info
-    version_vql = "SELECT server_version() AS version FROM scope()"
-    version_results = client.query(version_vql)
-
-    return json.dumps({
+    return dumps({
         "type": "server_info",
         "info": results[0] if results else {},
         "version": version_results[0].get("version") if version_results else "unknown",
-    }, indent=2, default=str)
+    })
 
 
-async def _handle_deployments_resource(path_parts: list[str]) -> str:
-    """Handle deployments resource requests."""
+def _list_deployments(deployer_cls: type) -> list[dict[str, Any]]:
+    """List one deployer's deployments, or none if it is unavailable."""
     try:
-        from ..deployment.deployers import DockerDeployer, BinaryDeployer
-        from ..deployment.profiles import DeploymentState
-
-        if not path_parts or not path_parts[0]:
-            # List all deployments
-            all_deployments = []
-
-            # Get Docker deployments
-            try:
-                docker_deployer = DockerDeployer()
-                deployments = docker_deployer.list_deployments()
-                all_deployments.extend([d.to_dict() for d in deployments])
-            except Exception:
-                pass
-
-            # Get binary deployments
-            try:
-                binary_deployer = BinaryDeployer()
-                deployments = binary_deployer.list_deployments()
-                all_deployments.extend([d.to_dict() for d in deployments])
-            except Exception:
-                pass
-
-            return json.dumps({
-                "type": "deployment_list",
-                "count": len(all_deployments),
-                "deployments": all_deployments,
-            }, indent=2, default=str)
+        return [d.to_dict() for d in deployer_cls().list_deployments()]
+    except Exception:
+        return []
 
-        else:
-            # Get specific deployment
-            deployment_id = path_parts[0]
-
-            # Try Docker first
-            try:
-                deployer = DockerDeployer()
-                info = await deployer.get_status(deployment_id)
-                if info:
-                    health = await deployer.health_check(deployment_id)
-                    return json.dumps({
-                        "type": "deployment_detail",
-                        "deployment": info.to_dict(),
-                        "health": health,
-                    }, indent=2, default=str)
-            except Exception:
-                pass
-
-            # Try binary deployer
-            try:
-                deployer = BinaryDeployer()
-                info = await deployer.get_status(deployment_id)
-                if info:
-                    health = await deployer.health_check(deployment_id)
-                    return json.dumps({
-                        "type": "deployment_detail",
-                        "deployment": info.to_dict(),
-                        "health": health,
-                    }, indent=2, default=str)
-            except Exception:
-                pass
-
-            return json.dumps({
-                "error": f"Deployment {deployment_id} not found"
-            }, indent=2)
-
-    except ImportError as e:
-        return json.dumps({
+
+async def _handle_deployments_resource(path_parts: list[str]) -> str:
+    """Handle deployments resource requests."""
+    if not HAS_DEPLOYERS:
+        return dumps({
             "type": "deployment_list",
             "count": 0,
             "deployments": [],
-            "note": f"Deployment features require additional packages: {str(e)}",
-        }, indent=2)
+            "note": f"Deployment features require additional packages: {_DEPLOYERS_IMPORT_ERROR}",
+        })
+
+    if not path_parts or not path_parts[0]:
+        # List Docker and binary deployments side by side
+        docker_deployments, binary_deployments = await asyncio.gather(
+            asyncio.to_thread(_list_deployments, DockerDeployer),
+            asyncio.to_thread(_list_deployments, BinaryDeployer),
+        )
+        all_deployments = docker_deployments + binary_deployments
+
+        return dumps({
+            "type": "deployment_list",
+            "count": len(all_deployments),
+            "deployments": all_deployments,
+        })
+
+    else:
+        # Get specific deployment
+        deployment_id = path_parts[0]
+
+        # Try Docker first
+        try:
+            deployer = DockerDeployer()
+            info = await deployer.get_status(deployment_id)
+            if info:
+                health = await deployer.health_check(deployment_id)
+                return dumps({
+                    "type": "deployment_detail",
+                    "deployment": info.to_dict(),
+                    "health": health,
+                })
+        except Exception:
+            pass
+
+        # Try binary deployer
+        try:
+            deployer = BinaryDeployer()
+            info = await deployer.get_status(deployment_id)
+            if info:
+                health = await deployer.health_check(deployment_id)
+                return dumps({
+                    "type": "deployment_detail",
+                    "deployment": info.to_dict(),
+                    "health": health,
+                })
+        except Exception:
+            pass
+
+        return _not_found(_DEPLOYMENT_NOT_FOUND, deployment_id)
 
 
 # Register resources using FastMCP @mcp.resource() decorator
@@ -0,0 +1,55 @@
+"""
+JSON serialization for MCP responses.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise, or for values orjson cannot encode (e.g. integers beyond 64 bits).
+
+Output is compact by default, since MCP clients parse rather than read it.
+Set MEGARAPTOR_PRETTY_JSON=1 to indent responses for debugging.
+"""
+
+import json
+import os
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Datetimes pass through to default=str so output matches the stdlib path
+    _ORJSON_BASE = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    _ORJSON_INDENTED = _ORJSON_BASE | orjson.OPT_INDENT_2
+
+PRETTY_BY_DEFAULT = os.environ.get("MEGARAPTOR_PRETTY_JSON", "").lower() in ("1", "true", "yes")
+
+
+def dumps(obj: Any, indent: Optional[bool] = None) -> str:
+    """Serialize an object to JSON text.
+
+    Values that are not natively JSON-serializable are rendered with str().
+
+    Args:
+        obj: The object to serialize
+        indent: Pretty-print with two-space indentation. Defaults to the
+                MEGARAPTOR_PRETTY_JSON setting (compact unless enabled).
+
+    Returns:
+        The JSON document as a string
+    """
+    if indent is None:
+        indent = PRETTY_BY_DEFAULT
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                default=str,
+                option=_ORJSON_INDENTED if indent else _ORJSON_BASE,
+            ).decode()
+        except TypeError:
+            # orjson.JSONEncodeError subclasses TypeError
+            pass
+    if indent:
+        return json.dumps(obj, indent=2, default=str)
+    return json.dumps(obj, separators=(",", ":"), default=str)
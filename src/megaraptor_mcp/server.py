@@ -7,6 +7,7 @@ An MCP server that provides access to Velociraptor DFIR capabilities.
 import asyncio
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from mcp.server.fastmcp import FastMCP
 
@@ -24,6 +25,9 @@ logger = logging.getLogger("megaraptor-mcp")
 # Tools, resources, and prompts register via decorators on import
 mcp = FastMCP("megaraptor-mcp")
 
+# Worker threads for blocking gRPC queries offloaded with asyncio.to_thread
+QUERY_WORKERS = 32
+
 
 def _register_all() -> None:
     """Import all tool/resource/prompt modules to trigger registration."""
@@ -41,11 +45,16 @@ def _register_all() -> None:
 
 async def run_server() -> None:
     """Run the MCP server."""
-    logger.info(f"Starting Megaraptor MCP Server v{__version__}")
+    logger.info("Starting Megaraptor MCP Server v%s", __version__)
 
     # Register all tools/resources/prompts
     _register_all()
 
+    # Size the default executor for concurrent Velociraptor queries
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="vql-query")
+    )
+
     # Run with stdio transport
     await mcp.run_stdio_async()
 
@@ -57,7 +66,7 @@ def main() -> None:
     except KeyboardInterrupt:
         logger.info("Server shutting down...")
     except Exception as e:
-        logger.error(f"Server error: {e}", exc_info=True)
+        logger.error("Server error: %s", e, exc_info=True)
         sys.exit(1)
 
 
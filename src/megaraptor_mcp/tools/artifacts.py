@@ -4,6 +4,7 @@ Artifact tools for Velociraptor MCP.
 Provides tools for listing, viewing, and collecting Velociraptor artifacts.
 """
 
+import asyncio
 import json
 from typing import Any, Optional
 
@@ -12,10 +13,13 @@ from mcp.types import TextContent
 
 from ..server import mcp
 from ..client import get_client
+from ..query_cache import ARTIFACT_CACHE, cached_query
+from ..serialization import dumps
 from ..error_handling import (
     validate_client_id,
     validate_limit,
     map_grpc_error,
+    vql_string,
 )
 
 
@@ -42,7 +46,7 @@ async def list_artifacts(
         if artifact_type and artifact_type.upper() not in ('CLIENT', 'SERVER', 'NOTEBOOK'):
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Invalid artifact_type '{artifact_type}'",
                     "hint": "Must be one of: CLIENT, SERVER, NOTEBOOK"
                 })
@@ -53,36 +57,45 @@ async def list_artifacts(
         # Build the VQL query
         conditions = []
         if search:
-            conditions.append(f"name =~ '{search}' OR description =~ '{search}'")
+            search_literal = vql_string(search)
+            conditions.append(f"name =~ {search_literal} OR description =~ {search_literal}")
         if artifact_type:
-            conditions.append(f"type = '{artifact_type}'")
+            conditions.append(f"type = {vql_string(artifact_type)}")
 
         where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
         vql = f"SELECT name, description, type, parameters FROM artifact_definitions(){where_clause} LIMIT {limit}"
 
-        results = client.query(vql)
-
-        # Format the results
-        formatted = []
-        for row in results:
-            artifact = {
-                "name": row.get("name", ""),
-                "description": (row.get("description", "") or "")[:200],  # Truncate long descriptions
-                "type": row.get("type", ""),
-                "has_parameters": bool(row.get("parameters")),
-            }
-            formatted.append(artifact)
+        # The rendered response is cached next to the rows it was built from,
+        # so both expire and are invalidated together
+        text_key = ("list_artifacts", id(client), vql)
+        text = ARTIFACT_CACHE.get(text_key)
+        if text is None:
+            results = await asyncio.to_thread(cached_query, client, vql)
+
+            # Format the results
+            formatted = []
+            for row in results:
+                artifact = {
+                    "name": row.get("name", ""),
+                    "description": (row.get("description", "") or "")[:200],  # Truncate long descriptions
+                    "type": row.get("type", ""),
+                    "has_parameters": bool(row.get("parameters")),
+                }
+                formatted.append(artifact)
+
+            text = dumps(formatted)
+            ARTIFACT_CACHE.put(text_key, text)
 
         return [TextContent(
             type="text",
-            text=json.dumps(formatted, indent=2)
+            text=text
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Check your limit parameter value"
             })
@@ -93,14 +106,14 @@ async def list_artifacts(
         error_info = map_grpc_error(e, "listing artifacts")
         return [TextContent(
             type="text",
-            text=json.dumps(error_info, indent=2)
+            text=dumps(error_info)
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to list artifacts",
                 "hint": "Check Velociraptor server connection and try again"
             })
@@ -122,7 +135,7 @@ async def get_artifact(artifact_name: str) -> list[TextContent]:
         if not artifact_name or not artifact_name.strip():
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Artifact name cannot be empty",
                     "hint": "Use list_artifacts tool to find available artifacts"
                 })
@@ -130,13 +143,13 @@ async def get_artifact(artifact_name: str) -> list[TextContent]:
 
         client = get_client()
 
-        vql = f"SELECT * FROM artifact_definitions(names='{artifact_name}')"
-        results = client.query(vql)
+        vql = f"SELECT * FROM artifact_definitions(names={vql_string(artifact_name)})"
+        results = await asyncio.to_thread(cached_query, client, vql)
 
         if not results:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Artifact '{artifact_name}' not found",
                     "hint": "Use list_artifacts tool to find available artifacts"
                 })
@@ -158,7 +171,7 @@ async def get_artifact(artifact_name: str) -> list[TextContent]:
 
         return [TextContent(
             type="text",
-            text=json.dumps(formatted, indent=2, default=str)
+            text=dumps(formatted)
         )]
 
     except grpc.RpcError as e:
@@ -166,14 +179,14 @@ async def get_artifact(artifact_name: str) -> list[TextContent]:
         error_info = map_grpc_error(e, f"fetching artifact '{artifact_name}'")
         return [TextContent(
             type="text",
-            text=json.dumps(error_info, indent=2)
+            text=dumps(error_info)
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to get artifact definition",
                 "hint": "Check Velociraptor server connection and try again"
             })
@@ -208,7 +221,7 @@ async def collect_artifact(
         if not artifacts:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "artifacts parameter is required and cannot be empty",
                     "hint": "Use list_artifacts tool to find available artifacts"
                 })
@@ -217,7 +230,7 @@ async def collect_artifact(
         if timeout < 1:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"timeout must be at least 1 second, got {timeout}",
                     "hint": "Specify a positive timeout value in seconds"
                 })
@@ -226,7 +239,7 @@ async def collect_artifact(
         client = get_client()
 
         # Build the artifacts list
-        artifacts_str = ", ".join(f"'{a}'" for a in artifacts)
+        artifacts_str = ", ".join(map(vql_string, artifacts))
 
         # Build the spec parameter if parameters are provided
         spec_part = ""
@@ -238,7 +251,7 @@ async def collect_artifact(
 
         vql = f"""
         SELECT collect_client(
-            client_id='{client_id}',
+            client_id={vql_string(client_id)},
             artifacts=[{artifacts_str}],
             timeout={timeout}
             {spec_part}
@@ -247,12 +260,12 @@ async def collect_artifact(
         FROM scope()
         """
 
-        results = client.query(vql)
+        results = await asyncio.to_thread(client.query, vql)
 
         if not results:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Failed to start collection",
                     "hint": "Verify client_id exists and is online"
                 })
@@ -262,20 +275,20 @@ async def collect_artifact(
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "status": "collection_started",
                 "client_id": client_id,
                 "artifacts": artifacts,
                 "flow_id": collection.get("flow_id", ""),
                 "request": collection.get("request", {}),
-            }, indent=2, default=str)
+            })
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Check your client_id and other parameters"
             })
@@ -286,14 +299,14 @@ async def collect_artifact(
         error_info = map_grpc_error(e, f"collecting artifact on client {client_id}")
         return [TextContent(
             type="text",
-            text=json.dumps(error_info, indent=2)
+            text=dumps(error_info)
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to schedule artifact collection",
                 "hint": "Check Velociraptor server connection and try again"
             })
@@ -4,7 +4,7 @@ Client management tools for Velociraptor MCP.
 Provides tools for listing, searching, and managing Velociraptor clients (endpoints).
 """
 
-import json
+import asyncio
 from typing import Optional
 
 import grpc
@@ -12,12 +12,57 @@ from mcp.types import TextContent
 
 from ..server import mcp
 from ..client import get_client
+from ..query_cache import CLIENT_CACHE
+from ..serialization import dumps
 from ..error_handling import (
     validate_client_id,
     validate_limit,
     map_grpc_error,
+    vql_string,
 )
 
+# list_clients projects just the summary fields on the server, rather than
+# transferring every clients() column and picking them out here
+_CLIENT_LIST_COLUMNS = (
+    "client_id, os_info.hostname AS hostname, os_info.system AS os, "
+    "os_info.release AS release, labels, last_seen_at, first_seen_at, last_ip"
+)
+_CLIENT_LIST_DEFAULTS = (
+    ("client_id", ""),
+    ("hostname", ""),
+    ("os", ""),
+    ("release", ""),
+    ("labels", []),
+    ("last_seen_at", ""),
+    ("first_seen_at", ""),
+    ("last_ip", ""),
+)
+
+# Client lists go stale faster than a single client's details
+_CLIENT_LIST_TTL = 10.0
+
+# Fixed error responses, serialized once at import
+_LIST_CLIENTS_ERROR = dumps({
+    "error": "Failed to list clients",
+    "hint": "Check Velociraptor server connection and try again",
+})
+_CLIENT_INFO_ERROR = dumps({
+    "error": "Failed to get client information",
+    "hint": "Check Velociraptor server connection and try again",
+})
+_BAD_OPERATION_ERROR = dumps({
+    "error": "Operation must be 'add' or 'remove'",
+    "hint": "Use operation='add' to add labels or operation='remove' to remove them",
+})
+_LABEL_ERROR = dumps({
+    "error": "Failed to update client labels",
+    "hint": "Check Velociraptor server connection and try again",
+})
+_QUARANTINE_ERROR = dumps({
+    "error": "Failed to quarantine client",
+    "hint": "Check Velociraptor server connection and try again",
+})
+
 
 @mcp.tool()
 async def list_clients(
@@ -38,50 +83,37 @@ async def list_clients(
         # Validate inputs
         limit = validate_limit(limit)
 
-        # Basic injection protection for search parameter
-        if search and (";" in search or "--" in search):
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "error": "Invalid search query: potentially unsafe characters detected",
-                    "hint": "Remove semicolons and SQL comment markers from search query"
-                })
-            )]
-
         client = get_client()
 
         if search:
-            vql = f"SELECT * FROM clients(search='{search}') LIMIT {limit}"
+            vql = f"SELECT {_CLIENT_LIST_COLUMNS} FROM clients(search={vql_string(search)}) LIMIT {limit}"
         else:
-            vql = f"SELECT * FROM clients() LIMIT {limit}"
-
-        results = client.query(vql)
-
-        # Format the results
-        formatted = []
-        for row in results:
-            client_info = {
-                "client_id": row.get("client_id", ""),
-                "hostname": row.get("os_info", {}).get("hostname", ""),
-                "os": row.get("os_info", {}).get("system", ""),
-                "release": row.get("os_info", {}).get("release", ""),
-                "labels": row.get("labels", []),
-                "last_seen_at": row.get("last_seen_at", ""),
-                "first_seen_at": row.get("first_seen_at", ""),
-                "last_ip": row.get("last_ip", ""),
-            }
-            formatted.append(client_info)
+            vql = f"SELECT {_CLIENT_LIST_COLUMNS} FROM clients() LIMIT {limit}"
+
+        text_key = ("list_clients", id(client), vql)
+        text = CLIENT_CACHE.get(text_key)
+        if text is None:
+            results = await asyncio.to_thread(client.query, vql)
+
+            # Rows arrive already shaped; fill in fields the server left empty
+            for row in results:
+                for field, default in _CLIENT_LIST_DEFAULTS:
+                    if row.get(field) is None:
+                        row[field] = default
+
+            text = dumps(results)
+            CLIENT_CACHE.put(text_key, text, ttl=_CLIENT_LIST_TTL)
 
         return [TextContent(
             type="text",
-            text=json.dumps(formatted, indent=2)
+            text=text
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Check your limit parameter value"
             })
@@ -92,17 +124,14 @@ async def list_clients(
         error_info = map_grpc_error(e, "listing clients")
         return [TextContent(
             type="text",
-            text=json.dumps(error_info, indent=2)
+            text=dumps(error_info)
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "error": "Failed to list clients",
-                "hint": "Check Velociraptor server connection and try again"
-            })
+            text=_LIST_CLIENTS_ERROR
         )]
 
 
@@ -122,29 +151,35 @@ async def get_client_info(client_id: str) -> list[TextContent]:
 
         client = get_client()
 
-        vql = f"SELECT * FROM clients(client_id='{client_id}')"
-        results = client.query(vql)
-
-        if not results:
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "error": f"Client {client_id} not found",
-                    "hint": "Use list_clients tool to find valid client IDs"
-                })
-            )]
+        vql = f"SELECT * FROM clients(client_id={vql_string(client_id)})"
+        text_key = ("get_client_info", id(client), vql)
+        text = CLIENT_CACHE.get(text_key)
+        if text is None:
+            results = await asyncio.to_thread(client.query, vql)
+
+            if not results:
+                return [TextContent(
+                    type="text",
+                    text=dumps({
+                        "error": f"Client {client_id} not found",
+                        "hint": "Use list_clients tool to find valid client IDs"
+                    })
+                )]
+
+            # Return the full client info
+            text = dumps(results[0])
+            CLIENT_CACHE.put(text_key, text)
 
-        # Return the full client info
         return [TextContent(
             type="text",
-            text=json.dumps(results[0], indent=2, default=str)
+            text=text
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide a valid client ID starting with 'C.'"
             })
@@ -155,17 +190,14 @@ async def get_client_info(client_id: str) -> list[TextContent]:
         error_info = map_grpc_error(e, f"fetching client {client_id}")
         return [TextContent(
             type="text",
-            text=json.dumps(error_info, indent=2)
+            text=dumps(error_info)
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "error": "Failed to get client information",
-                "hint": "Check Velociraptor server connection and try again"
-            })
+            text=_CLIENT_INFO_ERROR
         )]
 
 
@@ -192,43 +224,40 @@ async def label_client(
         if operation not in ("add", "remove"):
             return [TextContent(
                 type="text",
-                text=json.dumps({
-                    "error": "Operation must be 'add' or 'remove'",
-                    "hint": "Use operation='add' to add labels or operation='remove' to remove them"
-                })
+                text=_BAD_OPERATION_ERROR
             )]
 
         client = get_client()
 
         # Build the VQL for label modification
-        labels_str = ", ".join(f"'{label}'" for label in labels)
+        labels_str = ", ".join(map(vql_string, labels))
 
         if operation == "add":
-            vql = f"SELECT label(client_id='{client_id}', labels=[{labels_str}], op='set') FROM scope()"
+            vql = f"SELECT label(client_id={vql_string(client_id)}, labels=[{labels_str}], op='set') FROM scope()"
         else:
-            vql = f"SELECT label(client_id='{client_id}', labels=[{labels_str}], op='remove') FROM scope()"
+            vql = f"SELECT label(client_id={vql_string(client_id)}, labels=[{labels_str}], op='remove') FROM scope()"
 
-        results = client.query(vql)
-
-        # Get updated client info
-        info_vql = f"SELECT labels FROM clients(client_id='{client_id}')"
-        info_results = client.query(info_vql)
+        # Read back the updated labels in the same round trip. The server runs
+        # the statements of one request in order, so the read sees the change.
+        info_vql = f"SELECT labels FROM clients(client_id={vql_string(client_id)})"
+        _, info_results = await asyncio.to_thread(client.query_batch, [vql, info_vql])
+        CLIENT_CACHE.clear()
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "client_id": client_id,
                 "operation": operation,
                 "labels_modified": labels,
                 "current_labels": info_results[0].get("labels", []) if info_results else [],
-            }, indent=2)
+            })
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide a valid client ID starting with 'C.'"
             })
@@ -239,17 +268,14 @@ async def label_client(
         error_info = map_grpc_error(e, f"labeling client {client_id}")
         return [TextContent(
             type="text",
-            text=json.dumps(error_info, indent=2)
+            text=dumps(error_info)
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "error": "Failed to update client labels",
-                "hint": "Check Velociraptor server connection and try again"
-            })
+            text=_LABEL_ERROR
         )]
 
 
@@ -283,39 +309,41 @@ async def quarantine_client(
             # or appropriate artifact for the client's OS
             vql = f"""
             SELECT collect_client(
-                client_id='{client_id}',
+                client_id={vql_string(client_id)},
                 artifacts='Windows.Remediation.Quarantine',
-                env=dict(MessageBox='{message or "System quarantined by administrator"}')
+                env=dict(MessageBox={vql_string(message or "System quarantined by administrator")})
             ) FROM scope()
             """
         else:
             # Unquarantine
             vql = f"""
             SELECT collect_client(
-                client_id='{client_id}',
+                client_id={vql_string(client_id)},
                 artifacts='Windows.Remediation.Quarantine',
                 env=dict(RemovePolicy='Y')
             ) FROM scope()
             """
 
-        results = client.query(vql)
+        results = await asyncio.to_thread(client.query, vql)
+        # Quarantine state shows up in the client's labels
+        CLIENT_CACHE.clear()
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "client_id": client_id,
                 "action": "quarantine" if quarantine else "unquarantine",
                 "status": "initiated",
                 "message": message,
                 "result": results[0] if results else None,
-            }, indent=2, default=str)
+            })
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide a valid client ID starting with 'C.'"
             })
@@ -326,15 +354,12 @@ async def quarantine_client(
         error_info = map_grpc_error(e, f"quarantining client {client_id}")
         return [TextContent(
             type="text",
-            text=json.dumps(error_info, indent=2)
+            text=dumps(error_info)
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "error": "Failed to quarantine client",
-                "hint": "Check Velociraptor server connection and try again"
-            })
+            text=_QUARANTINE_ERROR
         )]
@@ -5,6 +5,7 @@ Provides tools for rapid deployment of Velociraptor servers and agents
 during active security incidents.
 """
 
+import asyncio
 import json
 import os
 import secrets
@@ -14,7 +15,9 @@ from typing import Any, Optional
 from mcp.types import TextContent
 
 from ..server import mcp
+from ..serialization import dumps
 from ..config import DeploymentConfig, generate_deployment_id
+from ..error_handling import vql_string
 from ..deployment.profiles import get_profile, PROFILES, DeploymentTarget
 
 
@@ -112,9 +115,9 @@ async def deploy_server(
             if not target_host:
                 return [TextContent(
                     type="text",
-                    text=json.dumps({
+                    text=dumps({
                         "error": "target_host is required for binary deployment"
-                    }, indent=2)
+                    })
                 )]
             from ..deployment.deployers import BinaryDeployer
             deployer = BinaryDeployer()
@@ -138,45 +141,45 @@ async def deploy_server(
         else:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Unknown deployment type: {deployment_type}",
                     "valid_types": ["docker", "binary", "aws", "azure"]
-                }, indent=2)
+                })
             )]
 
         # Return result with password visible (only time it's shown)
         return [TextContent(
             type="text",
-            text=json.dumps(result.to_dict(include_secrets=True), indent=2)
+            text=dumps(result.to_dict(include_secrets=True))
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "suggestion": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Check your deployment parameters"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to deploy server",
                 "hint": "Check deployment configuration and try again. Ensure Docker is running for docker deployments."
-            }, indent=2)
+            })
         )]
 
 
@@ -269,10 +272,10 @@ async def get_deployment_status(
             health = await deployer.health_check(deployment_id)
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     **info.to_dict(),
                     "health": health,
-                }, indent=2, default=str)
+                })
             )]
 
         # Try binary deployer
@@ -283,47 +286,47 @@ async def get_deployment_status(
             health = await deployer.health_check(deployment_id)
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     **info.to_dict(),
                     "health": health,
-                }, indent=2, default=str)
+                })
             )]
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Deployment not found: {deployment_id}",
                 "hint": "Use list_deployments tool to see available deployments"
-            }, indent=2)
+            })
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide a valid deployment ID starting with 'vr-'"
-            }, indent=2)
+            })
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to get deployment status",
                 "hint": "Check deployment ID and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -346,11 +349,11 @@ async def destroy_deployment(
     if not confirm:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Destruction not confirmed",
                 "message": "Set confirm=True to destroy the deployment",
                 "warning": "This action is irreversible. All data will be lost.",
-            }, indent=2)
+            })
         )]
 
     try:
@@ -376,7 +379,7 @@ async def destroy_deployment(
 
             return [TextContent(
                 type="text",
-                text=json.dumps(result.to_dict(), indent=2)
+                text=dumps(result.to_dict())
             )]
 
         # Try binary deployer
@@ -385,36 +388,36 @@ async def destroy_deployment(
 
         return [TextContent(
             type="text",
-            text=json.dumps(result.to_dict(), indent=2)
+            text=dumps(result.to_dict())
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide a valid deployment ID starting with 'vr-'"
-            }, indent=2)
+            })
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to destroy deployment",
                 "hint": "Check deployment ID and ensure deployment exists"
-            }, indent=2)
+            })
         )]
 
 
@@ -465,29 +468,29 @@ async def list_deployments(
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "count": len(filtered),
                 "deployments": filtered,
-            }, indent=2, default=str)
+            })
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to list deployments",
                 "hint": "Check deployment infrastructure is available"
-            }, indent=2)
+            })
         )]
 
 
@@ -529,10 +532,10 @@ async def generate_agent_installer(
         if not info:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Deployment not found: {deployment_id}",
                     "hint": "Use list_deployments tool to see available deployments"
-                }, indent=2)
+                })
             )]
 
         # Load certificates
@@ -542,9 +545,9 @@ async def generate_agent_installer(
         if not bundle:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Certificate bundle not found"
-                }, indent=2)
+                })
             )]
 
         # Determine installer type
@@ -574,26 +577,26 @@ async def generate_agent_installer(
 
         return [TextContent(
             type="text",
-            text=json.dumps(result.to_dict(), indent=2)
+            text=dumps(result.to_dict())
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -654,26 +657,26 @@ async def create_offline_collector(
 
         return [TextContent(
             type="text",
-            text=json.dumps(response, indent=2)
+            text=dumps(response)
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -712,10 +715,10 @@ async def generate_gpo_package(
         if not info:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Deployment not found: {deployment_id}",
                     "hint": "Use list_deployments tool to see available deployments"
-                }, indent=2)
+                })
             )]
 
         # Load certificates
@@ -725,9 +728,9 @@ async def generate_gpo_package(
         if not bundle:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Certificate bundle not found"
-                }, indent=2)
+                })
             )]
 
         # Create output directory
@@ -779,7 +782,7 @@ async def generate_gpo_package(
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "success": True,
                 "output_directory": str(output_dir),
                 "files": [
@@ -789,26 +792,26 @@ async def generate_gpo_package(
                 ],
                 "instructions": f"See {instructions_file.name} for deployment steps",
                 "ca_fingerprint": bundle.ca_fingerprint,
-            }, indent=2)
+            })
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -847,10 +850,10 @@ async def generate_ansible_playbook(
         if not info:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Deployment not found: {deployment_id}",
                     "hint": "Use list_deployments tool to see available deployments"
-                }, indent=2)
+                })
             )]
 
         # Load certificates
@@ -860,9 +863,9 @@ async def generate_ansible_playbook(
         if not bundle:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Certificate bundle not found"
-                }, indent=2)
+                })
             )]
 
         # Create Ansible config
@@ -885,7 +888,7 @@ async def generate_ansible_playbook(
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 **result.to_dict(),
                 "usage": [
                     "1. cd " + str(result.output_dir),
@@ -893,26 +896,26 @@ async def generate_ansible_playbook(
                     "3. Edit inventory.yml with your hosts",
                     "4. ansible-playbook -i inventory.yml deploy_agents.yml",
                 ],
-            }, indent=2)
+            })
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -953,10 +956,10 @@ async def deploy_agents_winrm(
         if not info:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Deployment not found: {deployment_id}",
                     "hint": "Use list_deployments tool to see available deployments"
-                }, indent=2)
+                })
             )]
 
         # Load certificates
@@ -966,9 +969,9 @@ async def deploy_agents_winrm(
         if not bundle:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Certificate bundle not found"
-                }, indent=2)
+                })
             )]
 
         # Generate client config
@@ -1004,40 +1007,40 @@ async def deploy_agents_winrm(
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "total": len(results),
                 "successful": sum(1 for r in results if r.success),
                 "failed": sum(1 for r in results if not r.success),
                 "results": [r.to_dict() for r in results],
-            }, indent=2)
+            })
         )]
 
     except ImportError:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "pywinrm not installed",
                 "suggestion": "pip install pywinrm"
-            }, indent=2)
+            })
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -1080,10 +1083,10 @@ async def deploy_agents_ssh(
         if not info:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Deployment not found: {deployment_id}",
                     "hint": "Use list_deployments tool to see available deployments"
-                }, indent=2)
+                })
             )]
 
         # Load certificates
@@ -1093,9 +1096,9 @@ async def deploy_agents_ssh(
         if not bundle:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Certificate bundle not found"
-                }, indent=2)
+                })
             )]
 
         # Generate client config
@@ -1131,40 +1134,40 @@ async def deploy_agents_ssh(
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "total": len(results),
                 "successful": sum(1 for r in results if r.success),
                 "failed": sum(1 for r in results if not r.success),
                 "results": [r.to_dict() for r in results],
-            }, indent=2)
+            })
         )]
 
     except ImportError:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "paramiko not installed",
                 "suggestion": "pip install paramiko"
-            }, indent=2)
+            })
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -1194,9 +1197,10 @@ async def check_agent_deployment(
         # Build VQL query
         conditions = []
         if client_search:
-            conditions.append(f"os_info.hostname =~ '{client_search}' OR client_id =~ '{client_search}'")
+            search_literal = vql_string(client_search)
+            conditions.append(f"os_info.hostname =~ {search_literal} OR client_id =~ {search_literal}")
         if labels:
-            label_conditions = " OR ".join(f"'{l}' in labels" for l in labels)
+            label_conditions = " OR ".join(f"{vql_string(l)} in labels" for l in labels)
             conditions.append(f"({label_conditions})")
 
         where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
@@ -1209,7 +1213,7 @@ async def check_agent_deployment(
         LIMIT 100
         """
 
-        results = client.query(vql)
+        results = await asyncio.to_thread(client.query, vql)
 
         # Categorize by status
         now = datetime.now(timezone.utc)
@@ -1231,33 +1235,33 @@ async def check_agent_deployment(
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "deployment_id": deployment_id,
                 "total_clients": len(results),
                 "online": len(online),
                 "offline": len(offline),
                 "online_clients": online,
                 "offline_clients": offline,
-            }, indent=2, default=str)
+            })
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -1290,10 +1294,10 @@ async def generate_server_config(
         if not info:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Deployment not found: {deployment_id}",
                     "hint": "Use list_deployments tool to see available deployments"
-                }, indent=2)
+                })
             )]
 
         # Load certificates
@@ -1303,9 +1307,9 @@ async def generate_server_config(
         if not bundle:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Certificate bundle not found"
-                }, indent=2)
+                })
             )]
 
         # Generate config
@@ -1344,20 +1348,20 @@ async def generate_server_config(
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -1393,10 +1397,10 @@ async def generate_api_credentials(
         if not info:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Deployment not found: {deployment_id}",
                     "hint": "Use list_deployments tool to see available deployments"
-                }, indent=2)
+                })
             )]
 
         # Load certificates
@@ -1406,9 +1410,9 @@ async def generate_api_credentials(
         if not bundle:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Certificate bundle not found"
-                }, indent=2)
+                })
             )]
 
         # Generate API client config (Velociraptor format)
@@ -1450,20 +1454,20 @@ async def generate_api_credentials(
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -1496,10 +1500,10 @@ async def rotate_certificates(
         if not info:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Deployment not found: {deployment_id}",
                     "hint": "Use list_deployments tool to see available deployments"
-                }, indent=2)
+                })
             )]
 
         # Load current certificates
@@ -1509,9 +1513,9 @@ async def rotate_certificates(
         if not bundle:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Certificate bundle not found"
-                }, indent=2)
+                })
             )]
 
         server_hostname = info.server_url.split("://")[1].split(":")[0]
@@ -1526,42 +1530,42 @@ async def rotate_certificates(
 
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "success": True,
                     "ca_rotated": True,
                     "new_ca_fingerprint": new_bundle.ca_fingerprint,
                     "warning": "All agents must be re-enrolled with new configuration",
                     "action_required": "Generate new agent installers and redeploy",
-                }, indent=2)
+                })
             )]
 
         else:
             # TODO: Implement server/client cert rotation without CA
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "Certificate rotation without CA is not yet implemented",
                     "suggestion": "Use rotate_ca=True to perform full rotation"
-                }, indent=2)
+                })
             )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -1596,10 +1600,10 @@ async def validate_deployment(
         if not info:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "valid": False,
                     "error": f"Deployment not found: {deployment_id}"
-                }, indent=2)
+                })
             )]
 
         checks.append({
@@ -1664,7 +1668,7 @@ async def validate_deployment(
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "valid": len(failed_checks) == 0,
                 "deployment_id": deployment_id,
                 "state": info.state.value,
@@ -1674,26 +1678,26 @@ async def validate_deployment(
                     "failed": len(failed_checks),
                 },
                 "checks": checks,
-            }, indent=2, default=str)
+            })
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
 
 
@@ -1729,10 +1733,10 @@ async def export_deployment_docs(
         if not info:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Deployment not found: {deployment_id}",
                     "hint": "Use list_deployments tool to see available deployments"
-                }, indent=2)
+                })
             )]
 
         # Load certificates
@@ -1807,31 +1811,31 @@ For issues, see the troubleshooting guide or contact your administrator.
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "success": True,
                 "output_directory": str(output_dir),
                 "files": [
                     str(readme_file),
                     str(ca_file) if bundle else None,
                 ],
-            }, indent=2)
+            })
         )]
 
     except ImportError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Missing dependency: {str(e)}",
                 "hint": "Install required packages with: pip install megaraptor-mcp[deployment]"
-            }, indent=2)
+            })
         )]
 
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Operation failed",
                 "hint": "Check deployment configuration and try again"
-            }, indent=2)
+            })
         )]
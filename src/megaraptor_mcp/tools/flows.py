@@ -4,19 +4,21 @@ Flow tools for Velociraptor MCP.
 Provides tools for tracking and managing Velociraptor collection flows.
 """
 
+import asyncio
 import grpc
-import json
 from typing import Optional
 
 from mcp.types import TextContent
 
 from ..server import mcp
 from ..client import get_client
+from ..serialization import dumps
 from ..error_handling import (
     validate_client_id,
     validate_flow_id,
     validate_limit,
     map_grpc_error,
+    vql_string,
 )
 
 
@@ -40,8 +42,8 @@ async def list_flows(
         limit = validate_limit(limit)
         client = get_client()
 
-        vql = f"SELECT * FROM flows(client_id='{client_id}') LIMIT {limit}"
-        results = client.query(vql)
+        vql = f"SELECT * FROM flows(client_id={vql_string(client_id)}) LIMIT {limit}"
+        results = await asyncio.to_thread(client.query, vql)
 
         # Format the results
         formatted = []
@@ -65,7 +67,7 @@ async def list_flows(
 
         return [TextContent(
             type="text",
-            text=json.dumps(formatted, indent=2, default=str)
+            text=dumps(formatted)
         )]
 
     except grpc.RpcError as e:
@@ -75,14 +77,14 @@ async def list_flows(
             error_response["hint"] = f"Client {client_id} may not exist. Use list_clients() to see available clients."
         return [TextContent(
             type="text",
-            text=json.dumps(error_response)
+            text=dumps(error_response)
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide a valid client ID starting with 'C.'"
             })
@@ -92,7 +94,7 @@ async def list_flows(
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to list flows",
                 "hint": "Check client ID and Velociraptor server connection"
             })
@@ -128,30 +130,30 @@ async def get_flow_results(
         if artifact:
             vql = f"""
             SELECT * FROM source(
-                client_id='{client_id}',
-                flow_id='{flow_id}',
-                artifact='{artifact}'
+                client_id={vql_string(client_id)},
+                flow_id={vql_string(flow_id)},
+                artifact={vql_string(artifact)}
             ) LIMIT {limit}
             """
         else:
             vql = f"""
             SELECT * FROM source(
-                client_id='{client_id}',
-                flow_id='{flow_id}'
+                client_id={vql_string(client_id)},
+                flow_id={vql_string(flow_id)}
             ) LIMIT {limit}
             """
 
-        results = client.query(vql)
+        results = await asyncio.to_thread(client.query, vql)
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "client_id": client_id,
                 "flow_id": flow_id,
                 "artifact": artifact,
                 "result_count": len(results),
                 "results": results,
-            }, indent=2, default=str)
+            })
         )]
 
     except grpc.RpcError as e:
@@ -161,14 +163,14 @@ async def get_flow_results(
             error_response["hint"] = f"Flow {flow_id} may not exist for client {client_id}. Use list_flows(client_id='{client_id}') to see available flows."
         return [TextContent(
             type="text",
-            text=json.dumps(error_response)
+            text=dumps(error_response)
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide valid client ID (C.*) and flow ID (F.*)"
             })
@@ -178,7 +180,7 @@ async def get_flow_results(
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to get flow results",
                 "hint": "Check IDs and Velociraptor server connection"
             })
@@ -205,13 +207,13 @@ async def get_flow_status(
         flow_id = validate_flow_id(flow_id)
         client = get_client()
 
-        vql = f"SELECT * FROM flows(client_id='{client_id}', flow_id='{flow_id}')"
-        results = client.query(vql)
+        vql = f"SELECT * FROM flows(client_id={vql_string(client_id)}, flow_id={vql_string(flow_id)})"
+        results = await asyncio.to_thread(client.query, vql)
 
         if not results:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Flow {flow_id} not found for client {client_id}",
                     "hint": f"Use list_flows(client_id='{client_id}') to see available flows."
                 })
@@ -239,7 +241,7 @@ async def get_flow_status(
 
         return [TextContent(
             type="text",
-            text=json.dumps(status, indent=2, default=str)
+            text=dumps(status)
         )]
 
     except grpc.RpcError as e:
@@ -249,13 +251,13 @@ async def get_flow_status(
             error_response["hint"] = f"Flow {flow_id} may not exist for client {client_id}. Use list_flows(client_id='{client_id}') to see available flows."
         return [TextContent(
             type="text",
-            text=json.dumps(error_response)
+            text=dumps(error_response)
         )]
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide valid client ID (C.*) and flow ID (F.*)"
             })
@@ -265,7 +267,7 @@ async def get_flow_status(
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to get flow status",
                 "hint": "Check IDs and Velociraptor server connection"
             })
@@ -292,17 +294,17 @@ async def cancel_flow(
         flow_id = validate_flow_id(flow_id)
         client = get_client()
 
-        vql = f"SELECT cancel_flow(client_id='{client_id}', flow_id='{flow_id}') FROM scope()"
-        results = client.query(vql)
+        vql = f"SELECT cancel_flow(client_id={vql_string(client_id)}, flow_id={vql_string(flow_id)}) FROM scope()"
+        results = await asyncio.to_thread(client.query, vql)
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "client_id": client_id,
                 "flow_id": flow_id,
                 "action": "cancelled",
                 "result": results[0] if results else None,
-            }, indent=2, default=str)
+            })
         )]
 
     except grpc.RpcError as e:
@@ -312,13 +314,13 @@ async def cancel_flow(
             error_response["hint"] = f"Flow {flow_id} may not exist for client {client_id}. Use list_flows(client_id='{client_id}') to see available flows."
         return [TextContent(
             type="text",
-            text=json.dumps(error_response)
+            text=dumps(error_response)
         )]
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide valid client ID (C.*) and flow ID (F.*)"
             })
@@ -328,7 +330,7 @@ async def cancel_flow(
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to cancel flow",
                 "hint": "Check IDs and Velociraptor server connection"
             })
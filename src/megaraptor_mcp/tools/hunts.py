@@ -4,6 +4,7 @@ Hunt tools for Velociraptor MCP.
 Provides tools for creating and managing Velociraptor hunts (mass collection campaigns).
 """
 
+import asyncio
 import grpc
 import json
 from typing import Any, Optional
@@ -12,10 +13,13 @@ from mcp.types import TextContent
 
 from ..server import mcp
 from ..client import get_client
+from ..query_cache import HUNT_CACHE
+from ..serialization import dumps
 from ..error_handling import (
     validate_hunt_id,
     validate_limit,
     map_grpc_error,
+    vql_string,
 )
 
 
@@ -51,7 +55,7 @@ async def create_hunt(
     if not artifacts:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "artifacts parameter is required and cannot be empty"
             })
         )]
@@ -59,7 +63,7 @@ async def create_hunt(
     if not description:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "description parameter is required and cannot be empty"
             })
         )]
@@ -67,7 +71,7 @@ async def create_hunt(
     if os_filter and os_filter not in ['windows', 'linux', 'darwin']:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": f"Invalid os_filter '{os_filter}'. Must be one of: windows, linux, darwin"
             })
         )]
@@ -76,12 +80,12 @@ async def create_hunt(
         client = get_client()
 
         # Build the artifacts list
-        artifacts_str = ", ".join(f"'{a}'" for a in artifacts)
+        artifacts_str = ", ".join(map(vql_string, artifacts))
 
         # Build optional parameters
         parts = [
             f"artifacts=[{artifacts_str}]",
-            f"description='{description}'",
+            f"description={vql_string(description)}",
             f"timeout={timeout}",
             f"expires=now() + {expires_hours * 3600}",
             f"pause={'true' if paused else 'false'}",
@@ -92,52 +96,53 @@ async def create_hunt(
             parts.append(f"spec={spec_json}")
 
         if include_labels:
-            labels_str = ", ".join(f"'{l}'" for l in include_labels)
+            labels_str = ", ".join(map(vql_string, include_labels))
             parts.append(f"include_labels=[{labels_str}]")
 
         if exclude_labels:
-            labels_str = ", ".join(f"'{l}'" for l in exclude_labels)
+            labels_str = ", ".join(map(vql_string, exclude_labels))
             parts.append(f"exclude_labels=[{labels_str}]")
 
         if os_filter:
-            parts.append(f"os='{os_filter}'")
+            parts.append(f"os={vql_string(os_filter)}")
 
         params_str = ", ".join(parts)
         vql = f"SELECT hunt({params_str}) AS hunt FROM scope()"
 
-        results = client.query(vql)
+        results = await asyncio.to_thread(client.query, vql)
+        HUNT_CACHE.clear()
 
         if not results:
             return [TextContent(
                 type="text",
-                text=json.dumps({"error": "Failed to create hunt"})
+                text=dumps({"error": "Failed to create hunt"})
             )]
 
         hunt = results[0].get("hunt", {})
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "status": "hunt_created",
                 "hunt_id": hunt.get("hunt_id", ""),
                 "description": description,
                 "artifacts": artifacts,
                 "state": "PAUSED" if paused else "RUNNING",
                 "expires": hunt.get("expires", ""),
-            }, indent=2, default=str)
+            })
         )]
 
     except grpc.RpcError as e:
         error_response = map_grpc_error(e, "hunt creation")
         return [TextContent(
             type="text",
-            text=json.dumps(error_response)
+            text=dumps(error_response)
         )]
     except Exception:
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Unexpected error during hunt creation",
                 "hint": "Check Velociraptor server logs or contact administrator"
             })
@@ -165,14 +170,14 @@ async def list_hunts(
         if state and state.upper() not in ['RUNNING', 'PAUSED', 'STOPPED', 'COMPLETED']:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Invalid state '{state}'. Must be one of: RUNNING, PAUSED, STOPPED, COMPLETED"
                 })
             )]
         client = get_client()
 
         vql = f"SELECT * FROM hunts() LIMIT {limit}"
-        results = client.query(vql)
+        results = await asyncio.to_thread(client.query, vql)
 
         # Filter by state if specified
         if state:
@@ -199,21 +204,21 @@ async def list_hunts(
 
         return [TextContent(
             type="text",
-            text=json.dumps(formatted, indent=2, default=str)
+            text=dumps(formatted)
         )]
 
     except grpc.RpcError as e:
         error_response = map_grpc_error(e, "hunt listing")
         return [TextContent(
             type="text",
-            text=json.dumps(error_response)
+            text=dumps(error_response)
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Check your limit parameter value"
             })
@@ -223,7 +228,7 @@ async def list_hunts(
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to list hunts",
                 "hint": "Check Velociraptor server connection and try again"
             })
@@ -254,20 +259,20 @@ async def get_hunt_results(
 
         # Build the VQL query
         if artifact:
-            vql = f"SELECT * FROM hunt_results(hunt_id='{hunt_id}', artifact='{artifact}') LIMIT {limit}"
+            vql = f"SELECT * FROM hunt_results(hunt_id={vql_string(hunt_id)}, artifact={vql_string(artifact)}) LIMIT {limit}"
         else:
-            vql = f"SELECT * FROM hunt_results(hunt_id='{hunt_id}') LIMIT {limit}"
+            vql = f"SELECT * FROM hunt_results(hunt_id={vql_string(hunt_id)}) LIMIT {limit}"
 
-        results = client.query(vql)
+        results = await asyncio.to_thread(client.query, vql)
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "hunt_id": hunt_id,
                 "artifact": artifact,
                 "result_count": len(results),
                 "results": results[:limit],
-            }, indent=2, default=str)
+            })
         )]
 
     except grpc.RpcError as e:
@@ -277,14 +282,14 @@ async def get_hunt_results(
             error_response["hint"] = f"Hunt {hunt_id} may not exist. Use list_hunts() to see available hunts."
         return [TextContent(
             type="text",
-            text=json.dumps(error_response)
+            text=dumps(error_response)
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide a valid hunt ID starting with 'H.'"
             })
@@ -294,7 +299,7 @@ async def get_hunt_results(
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to get hunt results",
                 "hint": "Check hunt ID and try again"
             })
@@ -329,7 +334,7 @@ async def modify_hunt(
         if action not in action_map:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": f"Invalid action '{action}'. Must be one of: start, pause, stop, archive"
                 })
             )]
@@ -338,24 +343,25 @@ async def modify_hunt(
 
         # Use the hunt() function to modify the hunt
         if action == "start":
-            vql = f"SELECT hunt_update(hunt_id='{hunt_id}', state='RUNNING') FROM scope()"
+            vql = f"SELECT hunt_update(hunt_id={vql_string(hunt_id)}, state='RUNNING') FROM scope()"
         elif action == "pause":
-            vql = f"SELECT hunt_update(hunt_id='{hunt_id}', state='PAUSED') FROM scope()"
+            vql = f"SELECT hunt_update(hunt_id={vql_string(hunt_id)}, state='PAUSED') FROM scope()"
         elif action == "stop":
-            vql = f"SELECT hunt_update(hunt_id='{hunt_id}', state='STOPPED') FROM scope()"
+            vql = f"SELECT hunt_update(hunt_id={vql_string(hunt_id)}, state='STOPPED') FROM scope()"
         else:  # archive
-            vql = f"SELECT hunt_update(hunt_id='{hunt_id}', state='ARCHIVED') FROM scope()"
+            vql = f"SELECT hunt_update(hunt_id={vql_string(hunt_id)}, state='ARCHIVED') FROM scope()"
 
-        results = client.query(vql)
+        results = await asyncio.to_thread(client.query, vql)
+        HUNT_CACHE.clear()
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "hunt_id": hunt_id,
                 "action": action,
                 "status": "success",
                 "result": results[0] if results else None,
-            }, indent=2, default=str)
+            })
         )]
 
     except grpc.RpcError as e:
@@ -365,14 +371,14 @@ async def modify_hunt(
             error_response["hint"] = f"Hunt {hunt_id} may not exist. Use list_hunts() to see available hunts."
         return [TextContent(
             type="text",
-            text=json.dumps(error_response)
+            text=dumps(error_response)
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Provide a valid hunt ID starting with 'H.'"
             })
@@ -382,7 +388,7 @@ async def modify_hunt(
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to modify hunt",
                 "hint": "Check hunt ID and action parameter"
             })
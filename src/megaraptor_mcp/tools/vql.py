@@ -4,14 +4,17 @@ VQL query tool for Velociraptor MCP.
 Provides a tool for executing arbitrary VQL (Velociraptor Query Language) queries.
 """
 
+import asyncio
+import re
 import grpc
-import json
 from typing import Any, Optional
 
 from mcp.types import TextContent
 
 from ..server import mcp
 from ..client import get_client
+from ..serialization import dumps
+from ..query_cache import ARTIFACT_CACHE
 from ..error_handling import (
     validate_vql_syntax_basics,
     validate_limit,
@@ -19,6 +22,10 @@ from ..error_handling import (
     extract_vql_error_hint,
 )
 
+# Calls that add, replace or remove artifact definitions. VQL function names
+# are case-insensitive, and whitespace may precede the argument list.
+_ARTIFACT_WRITE_RE = re.compile(r"\bartifact_(set|delete)\s*\(", re.I)
+
 
 @mcp.tool()
 async def run_vql(
@@ -53,7 +60,7 @@ async def run_vql(
         if not query or not query.strip():
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=dumps({
                     "error": "query parameter is required and cannot be empty"
                 })
             )]
@@ -66,15 +73,21 @@ async def run_vql(
         if "LIMIT" not in query_upper:
             query = f"{query.rstrip(';')} LIMIT {max_rows}"
         client = get_client()
-        results = client.query(query, env=env, org_id=org_id)
+        try:
+            results = await asyncio.to_thread(client.query, query, env=env, org_id=org_id)
+        finally:
+            # Artifact definitions may have changed, even if the query then
+            # failed part way; drop cached lookups
+            if _ARTIFACT_WRITE_RE.search(query):
+                ARTIFACT_CACHE.clear()
 
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "query": query,
                 "row_count": len(results),
                 "results": results,
-            }, indent=2, default=str)
+            })
         )]
 
     except grpc.RpcError as e:
@@ -90,14 +103,14 @@ async def run_vql(
         error_response["query"] = query
         return [TextContent(
             type="text",
-            text=json.dumps(error_response)
+            text=dumps(error_response)
         )]
 
     except ValueError as e:
         # Validation errors
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": str(e),
                 "hint": "Check VQL syntax and max_rows parameter"
             })
@@ -107,7 +120,7 @@ async def run_vql(
         # Generic errors - don't expose internals
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "error": "Failed to execute VQL query",
                 "hint": "Check VQL syntax and Velociraptor server connection"
             })
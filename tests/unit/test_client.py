@@ -0,0 +1,156 @@
+"""
+Unit tests for the Velociraptor client.
+
+Tests batched queries against a stub that replays canned responses, and
+how many attempts a failing query makes.
+"""
+
+import json
+
+import grpc
+import pytest
+from pyvelociraptor import api_pb2
+
+from megaraptor_mcp.client import VelociraptorClient
+from megaraptor_mcp.config import VelociraptorConfig
+from megaraptor_mcp.grpc_pool import ChannelPool
+
+
+class FakePool:
+    """Single-channel stand-in for ChannelPool."""
+
+    channels = ["channel"]
+
+    def call(self, fn):
+        return fn("channel")
+
+
+class FakeStub:
+    """Stub whose Query replays responses and records the request."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def Query(self, request, timeout=None):
+        self.requests.append(request)
+        return iter(self.responses)
+
+
+class FakeRpcError(grpc.RpcError):
+    """Raisable gRPC error with a fixed status code."""
+
+    def __init__(self, status_code: grpc.StatusCode):
+        super().__init__(status_code.name)
+        self._status_code = status_code
+
+    def code(self) -> grpc.StatusCode:
+        return self._status_code
+
+
+class FailingStub:
+    """Stub whose Query always fails, counting attempts across all stubs."""
+
+    def __init__(self, status_code: grpc.StatusCode, attempts: list):
+        self.status_code = status_code
+        self.attempts = attempts
+
+    def Query(self, request, timeout=None):
+        self.attempts.append(self)
+        raise FakeRpcError(self.status_code)
+
+
+def _response(name: str, rows) -> api_pb2.VQLResponse:
+    return api_pb2.VQLResponse(
+        Response=json.dumps(rows),
+        Query=api_pb2.VQLRequest(Name=name),
+    )
+
+
+@pytest.fixture
+def client():
+    """Client wired to a fake pool instead of a live server."""
+    velo = VelociraptorClient(
+        VelociraptorConfig(
+            api_url="https://localhost:8001",
+            client_cert="",
+            client_key="",
+            ca_cert="",
+        )
+    )
+    velo._pool = FakePool()
+    return velo
+
+
+@pytest.mark.unit
+class TestQueryBatch:
+    """Tests for VelociraptorClient.query_batch."""
+
+    def test_sends_all_queries_in_one_request(self, client):
+        """Test that every statement travels in a single named request."""
+        stub = FakeStub([])
+        client._stubs = {"channel": stub}
+
+        client.query_batch(["SELECT 1 FROM scope()", "SELECT 2 FROM scope()"])
+
+        assert len(stub.requests) == 1
+        queries = stub.requests[0].Query
+        assert [q.Name for q in queries] == ["0", "1"]
+        assert [q.VQL for q in queries] == [
+            "SELECT 1 FROM scope()",
+            "SELECT 2 FROM scope()",
+        ]
+
+    def test_splits_rows_by_query_name(self, client):
+        """Test that interleaved responses are grouped per query."""
+        client._stubs = {"channel": FakeStub([
+            _response("1", [{"version": "0.7.0"}]),
+            _response("0", [{"a": 1}]),
+            _response("0", {"a": 2}),
+            api_pb2.VQLResponse(log="progress", Query=api_pb2.VQLRequest(Name="0")),
+            _response("other", [{"ignored": True}]),
+        ])}
+
+        info, version = client.query_batch(["Q0", "Q1"])
+
+        assert info == [{"a": 1}, {"a": 2}]
+        assert version == [{"version": "0.7.0"}]
+
+
+@pytest.mark.unit
+class TestQueryRetries:
+    """Tests for how often a failing query is attempted."""
+
+    @pytest.fixture
+    def pooled_client(self, client):
+        """Client with a real four-channel pool that is never dialled."""
+        client._pool = ChannelPool("localhost:1", grpc.ssl_channel_credentials(), size=4)
+        yield client
+        client._pool.close()
+
+    def _fail_with(self, client, status_code):
+        attempts = []
+        client._stubs = {
+            channel: FailingStub(status_code, attempts)
+            for channel in client._pool.channels
+        }
+        return attempts
+
+    def test_resource_exhausted_tried_once_per_channel(self, pooled_client):
+        """Test that RESOURCE_EXHAUSTED is only retried by the channel pool."""
+        attempts = self._fail_with(pooled_client, grpc.StatusCode.RESOURCE_EXHAUSTED)
+
+        with pytest.raises(grpc.RpcError):
+            pooled_client.query("SELECT * FROM info()")
+
+        assert len(attempts) == 4
+        assert len(set(map(id, attempts))) == 4
+
+    def test_non_retryable_error_tried_once(self, pooled_client):
+        """Test that other errors reach the caller after a single attempt."""
+        attempts = self._fail_with(pooled_client, grpc.StatusCode.INVALID_ARGUMENT)
+
+        with pytest.raises(grpc.RpcError):
+            pooled_client.query("SELECT * FROM info()")
+
+        assert len(attempts) == 1
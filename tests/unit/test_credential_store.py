@@ -12,6 +12,7 @@ pytest.importorskip("cryptography")
 from megaraptor_mcp.deployment.security.credential_store import (
     StoredCredential,
     CredentialStore,
+    PasswordCredentialStore,
     generate_credential_id,
     generate_api_key,
     generate_password,
@@ -66,6 +67,22 @@ class TestStoredCredential:
 
         assert cred.is_expired() is True
 
+    def test_is_expired_with_reference_time(self):
+        """Test expiry is evaluated against an explicit reference time."""
+        expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+        cred = StoredCredential(
+            id="cred_004",
+            name="Test Credential",
+            credential_type="api_key",
+            created_at=datetime.now(timezone.utc).isoformat(),
+            expires_at=expiry.isoformat(),
+            deployment_id=None,
+            data={},
+        )
+
+        assert cred.is_expired(expiry - timedelta(seconds=1)) is False
+        assert cred.is_expired(expiry + timedelta(seconds=1)) is True
+
     def test_to_dict_excludes_data(self):
         """Test to_dict includes metadata but excludes sensitive data."""
         cred = StoredCredential(
@@ -143,6 +160,32 @@ class TestCredentialStore:
         assert retrieved.name == cred.name
         assert retrieved.data["api_key"] == "secret_key_12345"
 
+    def test_store_many(self, temp_credentials_dir):
+        """Test storing several credentials in one call."""
+        store = CredentialStore(
+            store_path=temp_credentials_dir / "test.enc",
+            key_file=temp_credentials_dir / "test.key",
+        )
+
+        creds = [
+            StoredCredential(
+                id=f"bulk_{i}",
+                name=f"Bulk {i}",
+                credential_type="api_key",
+                created_at=datetime.now(timezone.utc).isoformat(),
+                expires_at=None,
+                deployment_id="deploy_001",
+                data={"key": f"value_{i}"},
+            )
+            for i in range(3)
+        ]
+
+        ids = store.store_many(creds)
+
+        assert ids == ["bulk_0", "bulk_1", "bulk_2"]
+        assert store.get("bulk_2").data["key"] == "value_2"
+        assert len(store.list_credentials()) == 3
+
     def test_get_nonexistent_credential(self, temp_credentials_dir):
         """Test getting a non-existent credential returns None."""
         store = CredentialStore(
@@ -335,6 +378,27 @@ class TestCredentialStore:
         assert store.get("expired_2") is None
         assert store.get("valid") is not None
 
+    def test_cleanup_expired_noop_skips_write(self, temp_credentials_dir):
+        """Test that cleanup leaves the store file untouched when nothing expired."""
+        store = CredentialStore(
+            store_path=temp_credentials_dir / "test.enc",
+            key_file=temp_credentials_dir / "test.key",
+        )
+        store.store(StoredCredential(
+            id="valid",
+            name="Valid",
+            credential_type="api_key",
+            created_at=datetime.now(timezone.utc).isoformat(),
+            expires_at=None,
+            deployment_id="deploy_A",
+            data={},
+        ))
+        before = store.store_path.read_bytes()
+
+        assert store.cleanup_expired() == 0
+        assert store.clear_deployment("deploy_B") == 0
+        assert store.store_path.read_bytes() == before
+
     def test_clear_deployment(self, temp_credentials_dir):
         """Test removing all credentials for a deployment."""
         store = CredentialStore(
@@ -413,6 +477,65 @@ class TestCredentialStore:
 
         assert creds == []
 
+    def test_chacha20_store_readable(self, temp_credentials_dir, monkeypatch):
+        """Test that a store written without hardware AES decrypts anywhere."""
+        from megaraptor_mcp.deployment.security import credential_store
+
+        monkeypatch.setattr(credential_store, "HAS_HARDWARE_AES", False)
+        store1 = CredentialStore(
+            store_path=temp_credentials_dir / "chacha.enc",
+            key_file=temp_credentials_dir / "test.key",
+        )
+        store1.store(StoredCredential(
+            id="chacha",
+            name="ChaCha",
+            credential_type="api_key",
+            created_at=datetime.now(timezone.utc).isoformat(),
+            expires_at=None,
+            deployment_id=None,
+            data={"secret": "value"},
+        ))
+
+        raw = store1.store_path.read_bytes()
+        assert raw[0] == CredentialStore.CIPHER_CHACHA20_POLY1305
+
+        monkeypatch.setattr(credential_store, "HAS_HARDWARE_AES", True)
+        store2 = CredentialStore(
+            store_path=temp_credentials_dir / "chacha.enc",
+            key_file=temp_credentials_dir / "test.key",
+        )
+
+        assert store2.get("chacha").data["secret"] == "value"
+
+    def test_legacy_unprefixed_store_readable(self, temp_credentials_dir):
+        """Test that stores written before the cipher prefix still load."""
+        import json
+        import secrets
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+        key = secrets.token_bytes(32)
+        key_file = temp_credentials_dir / "legacy.key"
+        key_file.write_bytes(key)
+
+        legacy = {"old": {
+            "id": "old",
+            "name": "Old",
+            "credential_type": "api_key",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "expires_at": None,
+            "deployment_id": None,
+            "data": {"secret": "legacy"},
+        }}
+        nonce = secrets.token_bytes(12)
+        store_path = temp_credentials_dir / "legacy.enc"
+        store_path.write_bytes(
+            nonce + AESGCM(key).encrypt(nonce, json.dumps(legacy).encode(), None)
+        )
+
+        store = CredentialStore(store_path=store_path, key_file=key_file)
+
+        assert store.get("old").data["secret"] == "legacy"
+
     @pytest.mark.skipif(os.name == "nt", reason="Unix file permissions only")
     def test_key_file_permissions(self, temp_credentials_dir):
         """Test that key file has restrictive permissions."""
@@ -435,6 +558,150 @@ class TestCredentialStore:
         mode = store.key_file.stat().st_mode & 0o777
         assert mode == 0o600
 
+    def test_key_creation_race_uses_winning_key(self, temp_credentials_dir, monkeypatch):
+        """Test that losing the key-creation race adopts the other process's key."""
+        key_file = temp_credentials_dir / "test.key"
+        winner = b"w" * CredentialStore.KEY_SIZE
+        real_link = os.link
+
+        def link_after_other_process(src, dst):
+            # Another process finishes creating the key just before us
+            Path(dst).write_bytes(winner)
+            return real_link(src, dst)
+
+        monkeypatch.setattr(os, "link", link_after_other_process)
+        store = CredentialStore(
+            store_path=temp_credentials_dir / "test.enc", key_file=key_file
+        )
+
+        assert store._ensure_key() == winner
+        assert [p.name for p in temp_credentials_dir.iterdir()] == ["test.key"]
+
+    def test_key_created_without_hard_link_support(self, temp_credentials_dir, monkeypatch):
+        """Test that the key is still created where the filesystem lacks hard links."""
+        def no_links(src, dst):
+            raise PermissionError("operation not permitted")
+
+        monkeypatch.setattr(os, "link", no_links)
+        key_file = temp_credentials_dir / "test.key"
+        store = CredentialStore(
+            store_path=temp_credentials_dir / "test.enc", key_file=key_file
+        )
+
+        key = store._ensure_key()
+
+        assert len(key) == CredentialStore.KEY_SIZE
+        assert key_file.read_bytes() == key
+        assert [p.name for p in temp_credentials_dir.iterdir()] == ["test.key"]
+        if os.name != "nt":
+            assert key_file.stat().st_mode & 0o777 == 0o600
+
+    def test_truncated_key_file_rejected(self, temp_credentials_dir):
+        """Test that a partially written key file is not used as a key."""
+        key_file = temp_credentials_dir / "test.key"
+        key_file.write_bytes(b"short")
+        store = CredentialStore(
+            store_path=temp_credentials_dir / "test.enc", key_file=key_file
+        )
+
+        with pytest.raises(ValueError, match="truncated"):
+            store._ensure_key()
+
+
+@pytest.mark.unit
+class TestPasswordCredentialStore:
+    """Tests for PasswordCredentialStore."""
+
+    @pytest.fixture(autouse=True)
+    def fast_kdf(self, monkeypatch):
+        """Keep PBKDF2 cheap in tests."""
+        monkeypatch.setattr(PasswordCredentialStore, "ITERATIONS", 1000)
+
+    def _credential(self) -> StoredCredential:
+        return StoredCredential(
+            id="pw_cred",
+            name="Password Protected",
+            credential_type="api_key",
+            created_at=datetime.now(timezone.utc).isoformat(),
+            expires_at=None,
+            deployment_id=None,
+            data={"secret": "value"},
+        )
+
+    def test_store_and_get_with_password(self, temp_credentials_dir):
+        """Test that the same password decrypts the store."""
+        paths = {
+            "store_path": temp_credentials_dir / "pw.enc",
+            "salt_file": temp_credentials_dir / "pw.salt",
+        }
+        PasswordCredentialStore("correct horse", **paths).store(self._credential())
+
+        store = PasswordCredentialStore("correct horse", **paths)
+
+        assert store.get("pw_cred").data["secret"] == "value"
+        assert len(paths["salt_file"].read_bytes()) == PasswordCredentialStore.SALT_SIZE
+
+    def test_wrong_password_raises(self, temp_credentials_dir):
+        """Test that a different password cannot read the store."""
+        paths = {
+            "store_path": temp_credentials_dir / "pw.enc",
+            "salt_file": temp_credentials_dir / "pw.salt",
+        }
+        PasswordCredentialStore("correct horse", **paths).store(self._credential())
+
+        store = PasswordCredentialStore("battery staple", **paths)
+
+        with pytest.raises(ValueError, match="wrong master password"):
+            store.get("pw_cred")
+
+    def test_wrong_password_does_not_destroy_store(self, temp_credentials_dir):
+        """Test that writing with a wrong password leaves the store intact."""
+        paths = {
+            "store_path": temp_credentials_dir / "pw.enc",
+            "salt_file": temp_credentials_dir / "pw.salt",
+        }
+        PasswordCredentialStore("correct horse", **paths).store(self._credential())
+        before = paths["store_path"].read_bytes()
+
+        wrong = PasswordCredentialStore("battery staple", **paths)
+        other = self._credential()
+        other.id = "other"
+        with pytest.raises(ValueError):
+            wrong.store(other)
+
+        assert paths["store_path"].read_bytes() == before
+        store = PasswordCredentialStore("correct horse", **paths)
+        assert store.get("pw_cred").data["secret"] == "value"
+
+    def test_default_path_separate_from_key_file_store(self, tmp_path, monkeypatch):
+        """Test that the password store does not share the key-file store."""
+        monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+        monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+
+        key_store = CredentialStore()
+        password_store = PasswordCredentialStore("correct horse")
+
+        assert password_store.store_path != key_store.store_path
+        assert password_store.key_file != key_store.key_file
+
+    def test_truncated_salt_file_rejected(self, temp_credentials_dir):
+        """Test that a partially written salt is not used to derive a key."""
+        salt_file = temp_credentials_dir / "pw.salt"
+        salt_file.write_bytes(b"\x00" * 4)
+        store = PasswordCredentialStore(
+            "correct horse",
+            store_path=temp_credentials_dir / "pw.enc",
+            salt_file=salt_file,
+        )
+
+        with pytest.raises(ValueError, match="truncated"):
+            store.store(self._credential())
+
+    def test_empty_password_rejected(self, temp_credentials_dir):
+        """Test that an empty master password is rejected."""
+        with pytest.raises(ValueError):
+            PasswordCredentialStore("", store_path=temp_credentials_dir / "pw.enc")
+
 
 @pytest.mark.unit
 class TestHelperFunctions:
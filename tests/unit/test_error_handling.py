@@ -4,6 +4,9 @@ Unit tests for error handling utilities.
 Tests validators, gRPC error handlers, and VQL error hint extraction.
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from unittest.mock import Mock
 import grpc
@@ -14,8 +17,15 @@ from megaraptor_mcp.error_handling import (
     validate_hunt_id,
     validate_flow_id,
     validate_vql_syntax_basics,
+    vql_string,
     is_retryable_grpc_error,
     map_grpc_error,
+    build_channel_options,
+    build_default_service_config,
+    CircuitOpenError,
+    GrpcCircuitBreaker,
+    GrpcErrorInfo,
+    grpc_error_info,
     extract_vql_error_hint,
 )
 
@@ -48,6 +58,26 @@ def test_validate_client_id_invalid_format():
     assert "invalid-id" in str(exc_info.value)
 
 
+@pytest.mark.unit
+def test_validate_client_id_cached():
+    """Repeated valid client IDs are served from the validator cache."""
+    validate_client_id.cache_clear()
+    validate_client_id("C.cachedclient")
+    validate_client_id("C.cachedclient")
+
+    info = validate_client_id.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+
+@pytest.mark.unit
+def test_validate_client_id_invalid_not_cached():
+    """Invalid client IDs raise on every call."""
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            validate_client_id("not-a-client")
+
+
 @pytest.mark.unit
 def test_validate_limit_valid():
     """Valid limit passes validation."""
@@ -174,6 +204,19 @@ def test_validate_vql_syntax_valid():
     assert result == "SELECT * FROM info()"
 
 
+@pytest.mark.unit
+def test_vql_string_quotes_plain_value():
+    """Plain values are wrapped in single quotes unchanged."""
+    assert vql_string("host:workstation-01") == "'host:workstation-01'"
+
+
+@pytest.mark.unit
+def test_vql_string_escapes_quotes_and_backslashes():
+    """Quotes and backslashes cannot end the literal early."""
+    assert vql_string("x') OR 1 --") == "'x\\') OR 1 --'"
+    assert vql_string("C:\\Temp\\") == "'C:\\\\Temp\\\\'"
+
+
 # ==================== gRPC Handler Tests ====================
 
 
@@ -188,9 +231,9 @@ def create_mock_grpc_error(status_code: grpc.StatusCode, details: str = "") -> M
 
 @pytest.mark.unit
 def test_is_retryable_unavailable():
-    """UNAVAILABLE status code is retryable."""
+    """UNAVAILABLE is retried natively by the channel, not by the application."""
     error = create_mock_grpc_error(grpc.StatusCode.UNAVAILABLE)
-    assert is_retryable_grpc_error(error) is True
+    assert is_retryable_grpc_error(error) is False
 
 
 @pytest.mark.unit
@@ -202,9 +245,9 @@ def test_is_retryable_deadline_exceeded():
 
 @pytest.mark.unit
 def test_is_retryable_resource_exhausted():
-    """RESOURCE_EXHAUSTED status code is retryable."""
+    """RESOURCE_EXHAUSTED is retried by the channel pool, not by the application."""
     error = create_mock_grpc_error(grpc.StatusCode.RESOURCE_EXHAUSTED)
-    assert is_retryable_grpc_error(error) is True
+    assert is_retryable_grpc_error(error) is False
 
 
 @pytest.mark.unit
@@ -235,6 +278,31 @@ def test_is_retryable_non_grpc_error():
     assert is_retryable_grpc_error(None) is False
 
 
+@pytest.mark.unit
+def test_default_service_config_retry_policy():
+    """Service config retries transient codes natively on all methods."""
+    config = build_default_service_config()
+    method_config = config["methodConfig"][0]
+    policy = method_config["retryPolicy"]
+
+    assert method_config["name"] == [{}]
+    assert policy["maxAttempts"] == 5
+    assert "UNAVAILABLE" in policy["retryableStatusCodes"]
+    assert "DEADLINE_EXCEEDED" not in policy["retryableStatusCodes"]
+    assert "RESOURCE_EXHAUSTED" not in policy["retryableStatusCodes"]
+
+
+@pytest.mark.unit
+def test_channel_options_enable_retries():
+    """Channel options enable retries and carry the JSON service config."""
+    import json
+
+    options = dict(build_channel_options())
+
+    assert options["grpc.enable_retries"] == 1
+    assert json.loads(options["grpc.service_config"]) == build_default_service_config()
+
+
 @pytest.mark.unit
 def test_map_grpc_error_unavailable():
     """UNAVAILABLE error maps to user-friendly message."""
@@ -324,6 +392,18 @@ def test_map_grpc_error_internal():
     assert result["grpc_status"] == "INTERNAL"
 
 
+@pytest.mark.unit
+def test_map_grpc_error_resource_exhausted():
+    """RESOURCE_EXHAUSTED error maps to server load message."""
+    error = create_mock_grpc_error(grpc.StatusCode.RESOURCE_EXHAUSTED)
+    result = map_grpc_error(error, "hunt results")
+
+    assert "resources exhausted" in result["error"].lower()
+    assert "hunt results" in result["error"]
+    assert "heavy load" in result["hint"].lower()
+    assert result["grpc_status"] == "RESOURCE_EXHAUSTED"
+
+
 @pytest.mark.unit
 def test_map_grpc_error_unknown_code():
     """Unknown gRPC status code uses fallback."""
@@ -336,6 +416,26 @@ def test_map_grpc_error_unknown_code():
     assert result["grpc_status"] == "CANCELLED"
 
 
+@pytest.mark.unit
+def test_grpc_error_info_reused_for_static_messages():
+    """Detail-free errors return the same cached info instance."""
+    first = grpc_error_info(create_mock_grpc_error(grpc.StatusCode.UNAVAILABLE), "query")
+    second = grpc_error_info(create_mock_grpc_error(grpc.StatusCode.UNAVAILABLE), "query")
+
+    assert isinstance(first, GrpcErrorInfo)
+    assert first is second
+
+
+@pytest.mark.unit
+def test_map_grpc_error_returns_independent_dicts():
+    """Callers may edit the returned dict without affecting later calls."""
+    error = create_mock_grpc_error(grpc.StatusCode.NOT_FOUND)
+    first = map_grpc_error(error, "lookup")
+    first["hint"] = "custom hint"
+
+    assert map_grpc_error(error, "lookup")["hint"] != "custom hint"
+
+
 @pytest.mark.unit
 def test_map_grpc_error_exception_handling():
     """Handles exceptions when getting status code."""
@@ -350,6 +450,203 @@ def test_map_grpc_error_exception_handling():
     assert result["grpc_status"] == "UNKNOWN"
 
 
+class FakeClock:
+    """Manually advanced clock for circuit breaker tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRpcError(grpc.RpcError):
+    """Raisable gRPC error with a fixed status code."""
+
+    def __init__(self, status_code: grpc.StatusCode):
+        super().__init__(status_code.name)
+        self._status_code = status_code
+
+    def code(self) -> grpc.StatusCode:
+        return self._status_code
+
+    def details(self) -> str:
+        return ""
+
+
+def _failing_rpc(code: grpc.StatusCode):
+    def rpc():
+        raise FakeRpcError(code)
+    return rpc
+
+
+@pytest.mark.unit
+def test_circuit_breaker_opens_after_failures():
+    """Breaker opens once failures cross the threshold and then fails fast."""
+    clock = FakeClock()
+    breaker = GrpcCircuitBreaker(volume_threshold=3, sleep_window=10.0, clock=clock)
+    rpc = Mock(side_effect=_failing_rpc(grpc.StatusCode.UNAVAILABLE))
+
+    for _ in range(3):
+        with pytest.raises(grpc.RpcError):
+            breaker.call(rpc)
+
+    assert breaker.state == GrpcCircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.call(rpc)
+    assert rpc.call_count == 3
+    assert map_grpc_error(exc_info.value, "query")["grpc_status"] == "UNAVAILABLE"
+
+
+@pytest.mark.unit
+def test_circuit_breaker_ignores_non_connectivity_errors():
+    """NOT_FOUND and similar errors mean the server is up and don't trip the breaker."""
+    breaker = GrpcCircuitBreaker(volume_threshold=3, clock=FakeClock())
+
+    for _ in range(5):
+        with pytest.raises(grpc.RpcError):
+            breaker.call(_failing_rpc(grpc.StatusCode.NOT_FOUND))
+
+    assert breaker.state == GrpcCircuitBreaker.CLOSED
+
+
+@pytest.mark.unit
+def test_circuit_breaker_half_open_recovery():
+    """After the sleep window a successful trial call closes the breaker."""
+    clock = FakeClock()
+    breaker = GrpcCircuitBreaker(volume_threshold=2, sleep_window=10.0, clock=clock)
+
+    for _ in range(2):
+        with pytest.raises(grpc.RpcError):
+            breaker.call(_failing_rpc(grpc.StatusCode.UNAVAILABLE))
+    assert breaker.state == GrpcCircuitBreaker.OPEN
+
+    clock.now = 11.0
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == GrpcCircuitBreaker.CLOSED
+
+
+@pytest.mark.unit
+def test_circuit_breaker_half_open_failure_reopens():
+    """A failed trial call re-opens the breaker for another sleep window."""
+    clock = FakeClock()
+    breaker = GrpcCircuitBreaker(volume_threshold=2, sleep_window=10.0, clock=clock)
+
+    for _ in range(2):
+        with pytest.raises(grpc.RpcError):
+            breaker.call(_failing_rpc(grpc.StatusCode.UNAVAILABLE))
+
+    clock.now = 11.0
+    with pytest.raises(grpc.RpcError):
+        breaker.call(_failing_rpc(grpc.StatusCode.UNAVAILABLE))
+
+    assert breaker.state == GrpcCircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+
+
+@pytest.mark.unit
+def test_circuit_breaker_ignores_deadline_exceeded():
+    """Slow queries hitting their deadline don't trip the breaker."""
+    breaker = GrpcCircuitBreaker(volume_threshold=3, clock=FakeClock())
+
+    for _ in range(5):
+        with pytest.raises(grpc.RpcError):
+            breaker.call(_failing_rpc(grpc.StatusCode.DEADLINE_EXCEEDED))
+
+    assert breaker.state == GrpcCircuitBreaker.CLOSED
+
+
+@pytest.mark.unit
+def test_circuit_breaker_half_open_allows_single_trial():
+    """While the trial call is in flight, concurrent callers still fail fast."""
+    clock = FakeClock()
+    breaker = GrpcCircuitBreaker(volume_threshold=2, sleep_window=10.0, clock=clock)
+    for _ in range(2):
+        with pytest.raises(grpc.RpcError):
+            breaker.call(_failing_rpc(grpc.StatusCode.UNAVAILABLE))
+
+    clock.now = 11.0
+    trial_started = threading.Event()
+    release_trial = threading.Event()
+
+    def slow_trial():
+        trial_started.set()
+        release_trial.wait(5)
+        return "trial"
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        trial = pool.submit(breaker.call, slow_trial)
+        assert trial_started.wait(5)
+
+        rpc = Mock(return_value="ok")
+        for _ in range(3):
+            with pytest.raises(CircuitOpenError):
+                breaker.call(rpc)
+        rpc.assert_not_called()
+
+        release_trial.set()
+        assert trial.result(5) == "trial"
+
+    assert breaker.state == GrpcCircuitBreaker.CLOSED
+    assert breaker.call(rpc) == "ok"
+
+
+@pytest.mark.unit
+def test_circuit_breaker_stale_success_does_not_close():
+    """A call admitted before the circuit opened cannot decide the trial."""
+    clock = FakeClock()
+    breaker = GrpcCircuitBreaker(volume_threshold=2, sleep_window=10.0, clock=clock)
+    slow_call = breaker.before_call()
+    for _ in range(2):
+        with pytest.raises(grpc.RpcError):
+            breaker.call(_failing_rpc(grpc.StatusCode.UNAVAILABLE))
+
+    clock.now = 11.0
+    trial = breaker.before_call()
+    breaker.record_success(slow_call)
+    assert breaker.state == GrpcCircuitBreaker.HALF_OPEN
+
+    breaker.record_error(FakeRpcError(grpc.StatusCode.UNAVAILABLE), trial)
+    assert breaker.state == GrpcCircuitBreaker.OPEN
+    assert breaker.opened_at == 11.0
+
+
+@pytest.mark.unit
+def test_circuit_breaker_stale_failure_does_not_extend_open():
+    """Failures from calls admitted while closed don't push the sleep window back."""
+    clock = FakeClock()
+    breaker = GrpcCircuitBreaker(volume_threshold=2, sleep_window=10.0, clock=clock)
+    in_flight = [breaker.before_call() for _ in range(3)]
+    for token in in_flight[:2]:
+        breaker.record_error(FakeRpcError(grpc.StatusCode.UNAVAILABLE), token)
+    assert breaker.state == GrpcCircuitBreaker.OPEN
+
+    clock.now = 5.0
+    breaker.record_error(FakeRpcError(grpc.StatusCode.UNAVAILABLE), in_flight[2])
+
+    assert breaker.opened_at == 0.0
+    clock.now = 10.0
+    assert breaker.call(lambda: "ok") == "ok"
+
+
+@pytest.mark.unit
+def test_circuit_breaker_interrupted_trial_resolves():
+    """A trial call that dies with a non-gRPC error still ends the half-open state."""
+    clock = FakeClock()
+    breaker = GrpcCircuitBreaker(volume_threshold=2, sleep_window=10.0, clock=clock)
+    for _ in range(2):
+        with pytest.raises(grpc.RpcError):
+            breaker.call(_failing_rpc(grpc.StatusCode.UNAVAILABLE))
+
+    clock.now = 11.0
+    with pytest.raises(KeyboardInterrupt):
+        breaker.call(Mock(side_effect=KeyboardInterrupt))
+
+    assert breaker.call(lambda: "ok") == "ok"
+
+
 # ==================== VQL Helper Tests ====================
 
 
@@ -0,0 +1,88 @@
+"""
+Unit tests for the gRPC channel pool.
+
+Tests round-robin dispatch and sibling retry on RESOURCE_EXHAUSTED.
+"""
+
+import pytest
+import grpc
+
+from megaraptor_mcp.grpc_pool import ChannelPool
+
+
+class FakeRpcError(grpc.RpcError):
+    """Raisable gRPC error with a fixed status code."""
+
+    def __init__(self, status_code: grpc.StatusCode):
+        super().__init__(status_code.name)
+        self._status_code = status_code
+
+    def code(self) -> grpc.StatusCode:
+        return self._status_code
+
+
+@pytest.fixture
+def pool():
+    """Three-channel pool against an address that is never dialled."""
+    channel_pool = ChannelPool(
+        "localhost:1", grpc.ssl_channel_credentials(), size=3
+    )
+    yield channel_pool
+    channel_pool.close()
+
+
+@pytest.mark.unit
+class TestChannelPool:
+    """Tests for ChannelPool."""
+
+    def test_opens_distinct_channels(self, pool):
+        """Test that the pool opens one channel per slot."""
+        assert len(pool) == 3
+        assert len(set(map(id, pool.channels))) == 3
+
+    def test_pick_round_robin(self, pool):
+        """Test that pick cycles through every channel in order."""
+        picked = [pool.pick() for _ in range(6)]
+        assert picked == pool.channels * 2
+
+    def test_rejects_empty_pool(self):
+        """Test that a pool needs at least one channel."""
+        with pytest.raises(ValueError):
+            ChannelPool("localhost:1", grpc.ssl_channel_credentials(), size=0)
+
+    def test_call_moves_to_sibling_on_resource_exhausted(self, pool):
+        """Test that a saturated channel hands the call to the next one."""
+        seen = []
+
+        def fn(channel):
+            seen.append(channel)
+            if len(seen) == 1:
+                raise FakeRpcError(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            return "ok"
+
+        assert pool.call(fn) == "ok"
+        assert seen == pool.channels[:2]
+
+    def test_call_raises_after_every_channel_exhausted(self, pool):
+        """Test that RESOURCE_EXHAUSTED surfaces once each channel was tried."""
+        seen = []
+
+        def fn(channel):
+            seen.append(channel)
+            raise FakeRpcError(grpc.StatusCode.RESOURCE_EXHAUSTED)
+
+        with pytest.raises(grpc.RpcError):
+            pool.call(fn)
+        assert seen == pool.channels
+
+    def test_call_does_not_retry_other_errors(self, pool):
+        """Test that non-saturation errors are raised immediately."""
+        seen = []
+
+        def fn(channel):
+            seen.append(channel)
+            raise FakeRpcError(grpc.StatusCode.UNAVAILABLE)
+
+        with pytest.raises(grpc.RpcError):
+            pool.call(fn)
+        assert len(seen) == 1
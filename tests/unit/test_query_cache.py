@@ -0,0 +1,94 @@
+"""
+Unit tests for the read-only query result cache.
+
+Tests expiry, LRU eviction, and the cached_query helper.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from megaraptor_mcp.query_cache import QueryCache, cached_query
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+class TestQueryCache:
+    """Tests for QueryCache."""
+
+    def test_entry_expires_after_ttl(self):
+        """Test that entries are dropped once their TTL has passed."""
+        clock = FakeClock()
+        cache = QueryCache(ttl=10.0, clock=clock)
+        cache.put("k", [1])
+
+        clock.now = 9.9
+        assert cache.get("k") == [1]
+        clock.now = 10.0
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_overrides_default(self):
+        """Test that put() can give one entry a shorter lifetime."""
+        clock = FakeClock()
+        cache = QueryCache(ttl=30.0, clock=clock)
+        cache.put("short", 1, ttl=10.0)
+        cache.put("long", 2)
+
+        clock.now = 10.0
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted when full."""
+        cache = QueryCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_clear(self):
+        """Test that clear drops every entry."""
+        cache = QueryCache()
+        cache.put("a", 1)
+        cache.clear()
+        assert cache.get("a") is None
+
+
+@pytest.mark.unit
+class TestCachedQuery:
+    """Tests for cached_query()."""
+
+    def test_repeat_query_hits_cache(self):
+        """Test that the same VQL only reaches the server once."""
+        client = Mock()
+        client.query.return_value = [{"name": "Generic.Client.Info"}]
+        cache = QueryCache()
+
+        first = cached_query(client, "SELECT * FROM artifact_definitions()", cache)
+        second = cached_query(client, "SELECT * FROM artifact_definitions()", cache)
+
+        assert first == second == [{"name": "Generic.Client.Info"}]
+        client.query.assert_called_once()
+
+    def test_errors_are_not_cached(self):
+        """Test that a failed query is retried on the next call."""
+        client = Mock()
+        client.query.side_effect = [RuntimeError("boom"), []]
+        cache = QueryCache()
+
+        with pytest.raises(RuntimeError):
+            cached_query(client, "SELECT 1 FROM scope()", cache)
+        assert cached_query(client, "SELECT 1 FROM scope()", cache) == []
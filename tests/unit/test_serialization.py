@@ -0,0 +1,56 @@
+"""
+Unit tests for JSON serialization helpers.
+
+Tests the orjson fast path and the stdlib fallback.
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from megaraptor_mcp import serialization
+from megaraptor_mcp.serialization import dumps
+
+
+SAMPLE = {
+    "type": "hunt_results",
+    "count": 2,
+    "results": [{"a": 1, "b": [1.5, None, True]}, {"nested": {"x": "y"}}],
+    "empty": [],
+}
+
+
+@pytest.mark.unit
+class TestDumps:
+    """Tests for dumps()."""
+
+    def test_indented_matches_stdlib(self):
+        """Test that indented output matches json.dumps(indent=2)."""
+        assert dumps(SAMPLE, indent=True) == json.dumps(SAMPLE, indent=2)
+
+    def test_compact_matches_stdlib(self):
+        """Test that compact output matches json.dumps with tight separators."""
+        assert dumps(SAMPLE, indent=False) == json.dumps(SAMPLE, separators=(",", ":"))
+
+    def test_default_follows_pretty_setting(self, monkeypatch):
+        """Test that output is compact unless pretty-printing is enabled."""
+        monkeypatch.setattr(serialization, "PRETTY_BY_DEFAULT", False)
+        assert dumps(SAMPLE) == dumps(SAMPLE, indent=False)
+        monkeypatch.setattr(serialization, "PRETTY_BY_DEFAULT", True)
+        assert dumps(SAMPLE) == dumps(SAMPLE, indent=True)
+
+    def test_unknown_types_use_str(self):
+        """Test that datetimes and other objects are rendered with str()."""
+        when = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        assert json.loads(dumps({"when": when})) == {"when": str(when)}
+
+    def test_big_int_falls_back_to_stdlib(self):
+        """Test that values orjson rejects are still serialized."""
+        assert json.loads(dumps({"n": 2**70})) == {"n": 2**70}
+
+    def test_without_orjson(self, monkeypatch):
+        """Test the stdlib path when orjson is not installed."""
+        monkeypatch.setattr(serialization, "orjson", None)
+        assert dumps(SAMPLE, indent=True) == json.dumps(SAMPLE, indent=2, default=str)
+        assert dumps(SAMPLE, indent=False) == json.dumps(SAMPLE, separators=(",", ":"))
@@ -0,0 +1,61 @@
+"""
+Unit tests for the artifact tools.
+
+Tests that user-supplied values are quoted safely in the VQL sent to the
+server.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+# The tools register on the FastMCP server at import time
+pytest.importorskip("mcp.server.fastmcp")
+
+from megaraptor_mcp.query_cache import ARTIFACT_CACHE
+from megaraptor_mcp.tools import artifacts as artifact_tools
+
+# Tries to end the string literal early and append its own VQL
+QUOTED_NAME = "Generic.Client.Info') FROM scope() -- '\\"
+ESCAPED_NAME = "'Generic.Client.Info\\') FROM scope() -- \\'\\\\'"
+QUOTED_CLIENT_ID = "C.1', artifacts=['Evil'], x='"
+ESCAPED_CLIENT_ID = "'C.1\\', artifacts=[\\'Evil\\'], x=\\''"
+
+
+@pytest.fixture
+def velo(monkeypatch):
+    """Mock Velociraptor client returned by get_client()."""
+    client = Mock()
+    client.query.return_value = []
+    monkeypatch.setattr(artifact_tools, "get_client", lambda: client)
+    ARTIFACT_CACHE.clear()
+    yield client
+    ARTIFACT_CACHE.clear()
+
+
+@pytest.mark.unit
+class TestArtifactQuoting:
+    """Tests that quote-bearing values cannot inject VQL."""
+
+    async def test_get_artifact_escapes_name(self, velo):
+        """Test that get_artifact quotes the name, including in the cache key."""
+        await artifact_tools.get_artifact(QUOTED_NAME)
+
+        vql = velo.query.call_args.args[0]
+        assert vql == f"SELECT * FROM artifact_definitions(names={ESCAPED_NAME})"
+        assert ARTIFACT_CACHE.get((id(velo), vql)) == []
+
+    async def test_list_artifacts_escapes_search(self, velo):
+        """Test that the search term is quoted in both comparisons."""
+        await artifact_tools.list_artifacts(search=QUOTED_NAME)
+
+        vql = velo.query.call_args.args[0]
+        assert f"name =~ {ESCAPED_NAME} OR description =~ {ESCAPED_NAME}" in vql
+
+    async def test_collect_artifact_escapes_client_id_and_artifacts(self, velo):
+        """Test that collect_artifact quotes the client ID and artifact names."""
+        await artifact_tools.collect_artifact(QUOTED_CLIENT_ID, [QUOTED_NAME])
+
+        vql = velo.query.call_args.args[0]
+        assert f"client_id={ESCAPED_CLIENT_ID}," in vql
+        assert f"artifacts=[{ESCAPED_NAME}]" in vql
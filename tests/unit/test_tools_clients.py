@@ -0,0 +1,63 @@
+"""
+Unit tests for the client management tools.
+
+Tests that client IDs are quoted safely in the VQL sent to the server.
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+# The tools register on the FastMCP server at import time
+pytest.importorskip("mcp.server.fastmcp")
+
+from megaraptor_mcp.query_cache import CLIENT_CACHE
+from megaraptor_mcp.tools import clients as client_tools
+
+# Passes validate_client_id's prefix check but tries to end the literal early
+QUOTED_CLIENT_ID = "C.1') FROM scope() -- '\\"
+ESCAPED_CLIENT_ID = "'C.1\\') FROM scope() -- \\'\\\\'"
+
+
+@pytest.fixture
+def velo(monkeypatch):
+    """Mock Velociraptor client returned by get_client()."""
+    client = Mock()
+    monkeypatch.setattr(client_tools, "get_client", lambda: client)
+    CLIENT_CACHE.clear()
+    yield client
+    CLIENT_CACHE.clear()
+
+
+@pytest.mark.unit
+class TestClientIdQuoting:
+    """Tests that quote-bearing client IDs cannot inject VQL."""
+
+    async def test_get_client_info_escapes_client_id(self, velo):
+        """Test that get_client_info quotes the ID as one string literal."""
+        velo.query.return_value = [{"client_id": QUOTED_CLIENT_ID}]
+
+        await client_tools.get_client_info(QUOTED_CLIENT_ID)
+
+        vql = velo.query.call_args.args[0]
+        assert vql == f"SELECT * FROM clients(client_id={ESCAPED_CLIENT_ID})"
+
+    async def test_label_client_escapes_client_id(self, velo):
+        """Test that both label_client statements quote the ID."""
+        velo.query_batch.return_value = ([], [{"labels": ["a"]}])
+
+        result = await client_tools.label_client(QUOTED_CLIENT_ID, ["a"])
+
+        label_vql, info_vql = velo.query_batch.call_args.args[0]
+        assert f"label(client_id={ESCAPED_CLIENT_ID}," in label_vql
+        assert info_vql == f"SELECT labels FROM clients(client_id={ESCAPED_CLIENT_ID})"
+        assert json.loads(result[0].text)["client_id"] == QUOTED_CLIENT_ID
+
+    async def test_quarantine_client_escapes_client_id(self, velo):
+        """Test that quarantine_client quotes the ID."""
+        velo.query.return_value = [{}]
+
+        await client_tools.quarantine_client(QUOTED_CLIENT_ID)
+
+        assert f"client_id={ESCAPED_CLIENT_ID}," in velo.query.call_args.args[0]
@@ -0,0 +1,63 @@
+"""
+Unit tests for the flow tools.
+
+Tests that user-supplied values are quoted safely in the VQL sent to the
+server.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+# The tools register on the FastMCP server at import time
+pytest.importorskip("mcp.server.fastmcp")
+
+from megaraptor_mcp.tools import flows as flow_tools
+
+# Pass the ID prefix checks but try to end the string literal early
+QUOTED_CLIENT_ID = "C.1', flow_id='F.other"
+ESCAPED_CLIENT_ID = "'C.1\\', flow_id=\\'F.other'"
+QUOTED_FLOW_ID = "F.1') FROM scope() -- '\\"
+ESCAPED_FLOW_ID = "'F.1\\') FROM scope() -- \\'\\\\'"
+
+
+@pytest.fixture
+def velo(monkeypatch):
+    """Mock Velociraptor client returned by get_client()."""
+    client = Mock()
+    client.query.return_value = []
+    monkeypatch.setattr(flow_tools, "get_client", lambda: client)
+    return client
+
+
+@pytest.mark.unit
+class TestFlowQuoting:
+    """Tests that quote-bearing values cannot inject VQL."""
+
+    async def test_list_flows_escapes_client_id(self, velo):
+        """Test that list_flows quotes the client ID."""
+        await flow_tools.list_flows(QUOTED_CLIENT_ID)
+
+        vql = velo.query.call_args.args[0]
+        assert vql.startswith(f"SELECT * FROM flows(client_id={ESCAPED_CLIENT_ID})")
+
+    async def test_get_flow_results_escapes_values(self, velo):
+        """Test that the client ID, flow ID and artifact are quoted."""
+        await flow_tools.get_flow_results(
+            QUOTED_CLIENT_ID, QUOTED_FLOW_ID, artifact=QUOTED_FLOW_ID
+        )
+
+        vql = velo.query.call_args.args[0]
+        assert f"client_id={ESCAPED_CLIENT_ID}," in vql
+        assert f"flow_id={ESCAPED_FLOW_ID}," in vql
+        assert f"artifact={ESCAPED_FLOW_ID}" in vql
+
+    async def test_cancel_flow_escapes_ids(self, velo):
+        """Test that cancel_flow quotes both IDs."""
+        await flow_tools.cancel_flow(QUOTED_CLIENT_ID, QUOTED_FLOW_ID)
+
+        vql = velo.query.call_args.args[0]
+        assert vql == (
+            f"SELECT cancel_flow(client_id={ESCAPED_CLIENT_ID}, "
+            f"flow_id={ESCAPED_FLOW_ID}) FROM scope()"
+        )
@@ -0,0 +1,66 @@
+"""
+Unit tests for the hunt tools.
+
+Tests that user-supplied values are quoted safely in the VQL sent to the
+server.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+# The tools register on the FastMCP server at import time
+pytest.importorskip("mcp.server.fastmcp")
+
+from megaraptor_mcp.tools import hunts as hunt_tools
+
+# Tries to end the string literal early and append its own VQL
+QUOTED = "x') FROM scope() -- '\\"
+ESCAPED = "'x\\') FROM scope() -- \\'\\\\'"
+QUOTED_HUNT_ID = "H.1', state='ARCHIVED"
+ESCAPED_HUNT_ID = "'H.1\\', state=\\'ARCHIVED'"
+
+
+@pytest.fixture
+def velo(monkeypatch):
+    """Mock Velociraptor client returned by get_client()."""
+    client = Mock()
+    client.query.return_value = []
+    monkeypatch.setattr(hunt_tools, "get_client", lambda: client)
+    return client
+
+
+@pytest.mark.unit
+class TestHuntQuoting:
+    """Tests that quote-bearing values cannot inject VQL."""
+
+    async def test_create_hunt_escapes_values(self, velo):
+        """Test that artifacts, description and labels are quoted."""
+        await hunt_tools.create_hunt(
+            artifacts=[QUOTED],
+            description=QUOTED,
+            include_labels=[QUOTED],
+            exclude_labels=[QUOTED],
+        )
+
+        vql = velo.query.call_args.args[0]
+        assert f"artifacts=[{ESCAPED}]" in vql
+        assert f"description={ESCAPED}," in vql
+        assert f"include_labels=[{ESCAPED}]" in vql
+        assert f"exclude_labels=[{ESCAPED}]" in vql
+
+    async def test_get_hunt_results_escapes_values(self, velo):
+        """Test that the hunt ID and artifact are quoted."""
+        await hunt_tools.get_hunt_results(QUOTED_HUNT_ID, artifact=QUOTED)
+
+        vql = velo.query.call_args.args[0]
+        assert f"hunt_results(hunt_id={ESCAPED_HUNT_ID}, artifact={ESCAPED})" in vql
+
+    async def test_modify_hunt_escapes_hunt_id(self, velo):
+        """Test that modify_hunt quotes the hunt ID."""
+        await hunt_tools.modify_hunt(QUOTED_HUNT_ID, "pause")
+
+        vql = velo.query.call_args.args[0]
+        assert vql == (
+            f"SELECT hunt_update(hunt_id={ESCAPED_HUNT_ID}, state='PAUSED') FROM scope()"
+        )
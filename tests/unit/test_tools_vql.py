@@ -0,0 +1,72 @@
+"""
+Unit tests for the run_vql tool.
+
+Tests that queries changing artifact definitions invalidate the artifact cache.
+"""
+
+from unittest.mock import Mock
+
+import grpc
+import pytest
+
+# The tools register on the FastMCP server at import time
+pytest.importorskip("mcp.server.fastmcp")
+
+from megaraptor_mcp.query_cache import ARTIFACT_CACHE
+from megaraptor_mcp.tools import vql as vql_tools
+
+
+class FakeRpcError(grpc.RpcError):
+    """Raisable gRPC error with a fixed status code."""
+
+    def code(self) -> grpc.StatusCode:
+        return grpc.StatusCode.INTERNAL
+
+    def details(self) -> str:
+        return "boom"
+
+
+@pytest.fixture
+def velo(monkeypatch):
+    """Mock Velociraptor client returned by get_client()."""
+    client = Mock()
+    client.query.return_value = []
+    monkeypatch.setattr(vql_tools, "get_client", lambda: client)
+    ARTIFACT_CACHE.clear()
+    ARTIFACT_CACHE.put("cached", [{"name": "Generic.Client.Info"}])
+    yield client
+    ARTIFACT_CACHE.clear()
+
+
+@pytest.mark.unit
+class TestArtifactCacheInvalidation:
+    """Tests for when run_vql drops cached artifact lookups."""
+
+    @pytest.mark.parametrize("query", [
+        "SELECT artifact_set(definition=Def) FROM scope()",
+        "SELECT ARTIFACT_SET(definition=Def) FROM scope()",
+        "SELECT Artifact_Delete (name='Custom.Test') FROM scope()",
+    ])
+    async def test_artifact_writes_clear_cache(self, velo, query):
+        """Test that artifact writes clear the cache whatever their case."""
+        await vql_tools.run_vql(query)
+
+        assert ARTIFACT_CACHE.get("cached") is None
+
+    async def test_failed_artifact_write_clears_cache(self, velo):
+        """Test that the cache is cleared even when the write query fails."""
+        velo.query.side_effect = FakeRpcError()
+
+        await vql_tools.run_vql("SELECT artifact_set(definition=Def) FROM scope()")
+
+        assert ARTIFACT_CACHE.get("cached") is None
+
+    @pytest.mark.parametrize("query", [
+        "SELECT * FROM artifact_definitions()",
+        "SELECT * FROM info() WHERE my_artifact_set = 1",
+    ])
+    async def test_reads_keep_cache(self, velo, query):
+        """Test that queries not writing artifacts leave the cache alone."""
+        await vql_tools.run_vql(query)
+
+        assert ARTIFACT_CACHE.get("cached") == [{"name": "Generic.Client.Info"}]